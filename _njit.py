@@ -0,0 +1,20 @@
+"""
+Optional numba shim.
+
+Exposes @njit with a no-op fallback so the numeric kernels still run
+(as plain Python) when numba is not installed.
+"""
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op decorator used when numba is unavailable."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
@@ -0,0 +1,139 @@
+"""
+Compiled core of the backtest simulation.
+
+The bar-by-bar trade loop runs purely on numpy arrays so numba can
+compile it to native code (falls back to plain Python via _njit when
+numba is missing). The Backtester converts the returned trade matrix
+back into its dict-based records once at the end.
+"""
+import numpy as np
+from _njit import njit
+
+# Columns of the trade matrix returned by simulate()
+TRADE_ENTRY_BAR = 0
+TRADE_EXIT_BAR = 1
+TRADE_ENTRY_PRICE = 2
+TRADE_EXIT_PRICE = 3
+TRADE_SHARES = 4
+TRADE_PNL = 5
+TRADE_PNL_PCT = 6
+
+
+@njit(cache=True)
+def simulate(close, signals, initial_capital, max_position_size, warmup=50):
+    """
+    Run the long-only state machine over one symbol's bars.
+
+    Args:
+        close: float64 array of closing prices
+        signals: int8 array of per-bar signals (1 BUY, -1 SELL, 0 HOLD)
+        initial_capital: capital available at the first bar
+        max_position_size: fraction of capital per position
+        warmup: bars to skip so indicators have enough history
+
+    Returns:
+        (trades, equity, final_capital) where trades is an (n_trades, 7)
+        float64 matrix laid out per the TRADE_* column constants and
+        equity is the per-bar portfolio value.
+    """
+    n = close.shape[0]
+    trades = np.empty((n, 7))
+    n_trades = 0
+    capital = initial_capital
+    shares = 0
+    entry_price = 0.0
+    entry_bar = -1
+    cost = 0.0
+    equity = np.empty(n)
+
+    for i in range(n):
+        price = close[i]
+        if i >= warmup:
+            sig = signals[i]
+            if sig == 1 and shares == 0:
+                size = int(capital * max_position_size / price)
+                if size < 1:
+                    size = 1  # At least 1 share, matching strategy sizing
+                max_shares = int(capital // price)
+                if size > max_shares:
+                    size = max_shares
+                if size > 0:
+                    shares = size
+                    entry_price = price
+                    entry_bar = i
+                    cost = shares * price
+                    capital -= cost
+            elif sig == -1 and shares > 0:
+                proceeds = shares * price
+                capital += proceeds
+                trades[n_trades, 0] = entry_bar
+                trades[n_trades, 1] = i
+                trades[n_trades, 2] = entry_price
+                trades[n_trades, 3] = price
+                trades[n_trades, 4] = shares
+                trades[n_trades, 5] = proceeds - cost
+                trades[n_trades, 6] = (price - entry_price) / entry_price * 100
+                n_trades += 1
+                shares = 0
+        equity[i] = capital + shares * price
+
+    # Close any remaining position at the final bar
+    if shares > 0:
+        price = close[n - 1]
+        proceeds = shares * price
+        capital += proceeds
+        trades[n_trades, 0] = entry_bar
+        trades[n_trades, 1] = n - 1
+        trades[n_trades, 2] = entry_price
+        trades[n_trades, 3] = price
+        trades[n_trades, 4] = shares
+        trades[n_trades, 5] = proceeds - cost
+        trades[n_trades, 6] = (price - entry_price) / entry_price * 100
+        n_trades += 1
+        equity[n - 1] = capital
+
+    return trades[:n_trades], equity, capital
+
+
+@njit(cache=True)
+def equity_metrics(values):
+    """
+    Fused single pass over the equity curve.
+
+    Tracks the running peak for max drawdown and the Welford running
+    mean/variance of bar-to-bar returns, so drawdown and Sharpe inputs
+    come out of one traversal instead of the cummax + diff + mean/std
+    chain (same arithmetic, one read of the array, no temporaries).
+
+    Returns:
+        (max_drawdown, mean_return, std_return) with max_drawdown as a
+        negative fraction and std the sample (ddof=1) deviation.
+    """
+    n = values.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0
+
+    peak = values[0]
+    max_dd = 0.0
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    prev = values[0]
+
+    for i in range(n):
+        v = values[i]
+        if v > peak:
+            peak = v
+        dd = (v - peak) / peak
+        if dd < max_dd:
+            max_dd = dd
+        if i > 0:
+            r = (v - prev) / prev
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+        prev = v
+
+    std = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+    return max_dd, mean, std
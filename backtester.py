@@ -1,48 +1,114 @@
 """
 Backtesting framework for testing strategies on historical data.
 """
+import os
+import sys
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
 from datetime import datetime
 import logging
 from data_fetcher import MarketData
 from strategies import StrategyFactory
 from config import Config
+from _sim_core import (
+    simulate, equity_metrics, TRADE_ENTRY_BAR, TRADE_EXIT_BAR,
+    TRADE_ENTRY_PRICE, TRADE_EXIT_PRICE, TRADE_SHARES, TRADE_PNL,
+    TRADE_PNL_PCT
+)
 
 logger = logging.getLogger(__name__)
 
 class Backtester:
     """Backtest trading strategies on historical data."""
     
-    def __init__(self, strategy_name: str, initial_capital: float = 10000):
+    def __init__(self, strategy_name: str, initial_capital: float = 10000,
+                 verbose: bool = True):
+        self.strategy_name = strategy_name
         self.strategy = StrategyFactory.create_strategy(strategy_name)
         self.initial_capital = initial_capital
+        self.verbose = verbose
         self.capital = initial_capital
-        self.positions = {}
-        self.trades = []
-        self.equity_curve = []
+        # Trades are stored columnarly (dict of parallel lists) so the
+        # results pass can go straight to numpy without building a
+        # DataFrame from per-trade dicts
+        self.trades = {
+            'symbol': [], 'entry_date': [], 'exit_date': [],
+            'entry_price': [], 'exit_price': [], 'shares': [],
+            'pnl': [], 'pnl_pct': []
+        }
+        # Equity curve buffers: one (dates, values) numpy pair per symbol,
+        # concatenated once in _calculate_results - no per-bar dict
+        # allocation
+        self._equity_dates = []
+        self._equity_values = []
         self.market_data = MarketData()
+        # Position state is kept struct-of-arrays: parallel numpy arrays
+        # indexed by symbol (see _allocate_position_state), which keeps
+        # valuation a dot product instead of dict-of-dict traversal.
+        self._sym_idx = {}
+        self._allocate_position_state(0)
+
+    def _allocate_position_state(self, n_symbols: int):
+        """Allocate the parallel position arrays for n_symbols."""
+        self._shares = np.zeros(n_symbols)
+        self._entry_price = np.zeros(n_symbols)
+        self._cost = np.zeros(n_symbols)
+        self._entry_dates = [None] * n_symbols
+        self._open_mask = np.zeros(n_symbols, dtype=bool)
     
-    def run_backtest(self, symbols: List[str], start_date: str, 
-                    end_date: str = None) -> Dict:
+    def run_backtest(self, symbols: List[str], start_date: str,
+                    end_date: str = None, parallel: bool = False) -> Dict:
         """
         Run backtest on given symbols and date range.
-        
+
         Args:
             symbols: List of stock tickers
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD), defaults to today
+            parallel: Run symbols across worker processes. Each worker
+                gets an equal share of the initial capital and the
+                results are merged, so metrics stay coherent.
         """
         logger.info(f"Starting backtest: {self.strategy.name} strategy")
         logger.info(f"Symbols: {symbols}, Period: {start_date} to {end_date or 'now'}")
-        
-        for symbol in symbols:
-            self._backtest_symbol(symbol, start_date, end_date)
-        
+
+        self._sym_idx = {symbol: i for i, symbol in enumerate(symbols)}
+        self._allocate_position_state(len(symbols))
+
+        if parallel and len(symbols) > 1:
+            self._run_parallel(symbols, start_date, end_date)
+        else:
+            for symbol in symbols:
+                self._backtest_symbol(symbol, start_date, end_date)
+
         results = self._calculate_results()
         self._print_results(results)
         return results
+
+    def _run_parallel(self, symbols: List[str], start_date: str, end_date: str):
+        """Backtest each symbol in its own process and merge the results.
+
+        Symbols are independent (separate fetch, indicators, simulation),
+        so the work is embarrassingly parallel. Capital is partitioned
+        evenly across workers and re-aggregated at the end.
+        """
+        capital_share = self.initial_capital / len(symbols)
+        worker_args = [
+            (self.strategy_name, symbol, start_date, end_date, capital_share)
+            for symbol in symbols
+        ]
+        self.capital = 0.0
+        max_workers = min(len(symbols), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for trades, eq_dates, eq_values, capital in executor.map(
+                    _backtest_symbol_worker, worker_args):
+                for key, column in trades.items():
+                    self.trades[key].extend(column)
+                self._equity_dates.extend(eq_dates)
+                self._equity_values.extend(eq_values)
+                self.capital += capital
     
     def _backtest_symbol(self, symbol: str, start_date: str, end_date: str = None):
         """Backtest a single symbol."""
@@ -54,113 +120,124 @@ class Backtester:
             return
         
         # Add technical indicators
-        data = self.market_data.calculate_technical_indicators(data)
-        
-        # Filter by date range
-        if start_date:
-            data = data[data.index >= start_date]
-        if end_date:
-            data = data[data.index <= end_date]
-        
-        # Simulate trading
-        for i in range(50, len(data)):  # Start after enough data for indicators
-            current_data = data.iloc[:i+1]
-            current_price = data.iloc[i]['Close']
-            current_date = data.index[i]
-            
-            # Generate signal
-            signal = self.strategy.generate_signals(symbol, current_data)
-            
-            # Execute trades based on signal
-            if signal == 'BUY' and symbol not in self.positions:
-                self._open_position(symbol, current_price, current_date)
-            
-            elif signal == 'SELL' and symbol in self.positions:
-                self._close_position(symbol, current_price, current_date)
-            
-            # Update equity curve
-            portfolio_value = self._calculate_portfolio_value(data.iloc[i])
-            self.equity_curve.append({
-                'date': current_date,
-                'value': portfolio_value
-            })
+        data = self.market_data.calculate_technical_indicators(data, symbol)
+
+        # Filter by date range with a label-based slice: the sorted
+        # DatetimeIndex makes this a binary search instead of parsing the
+        # date string against every row and materializing a boolean mask
+        if start_date or end_date:
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index()
+            data = data.loc[start_date:end_date]
         
-        # Close any remaining positions at the end
-        if symbol in self.positions:
-            final_price = data.iloc[-1]['Close']
-            final_date = data.index[-1]
-            self._close_position(symbol, final_price, final_date)
+        # Precompute the full signal vector once instead of re-running the
+        # strategy on a growing data.iloc[:i+1] slice for every bar.
+        close = data['Close'].to_numpy(dtype=np.float64)
+        dates = data.index
+        signals = self.strategy.generate_signals_vectorized(data)
+        n = len(data)
+
+        if n == 0:
+            return
+
+        # Run the compiled state machine over the bars; convert the trade
+        # matrix back to dict records only once at the end.
+        trade_matrix, equity, final_capital = simulate(
+            close, signals, self.capital, Config.MAX_POSITION_SIZE
+        )
+        self.capital = float(final_capital)
+
+        for row in trade_matrix:
+            self._record_trade(
+                symbol,
+                dates[int(row[TRADE_ENTRY_BAR])], dates[int(row[TRADE_EXIT_BAR])],
+                row[TRADE_ENTRY_PRICE], row[TRADE_EXIT_PRICE],
+                int(row[TRADE_SHARES]), row[TRADE_PNL], row[TRADE_PNL_PCT]
+            )
+
+        self._equity_dates.append(dates.values[50:])
+        self._equity_values.append(equity[50:])
     
+    def _record_trade(self, symbol, entry_date, exit_date, entry_price,
+                      exit_price, shares, pnl, pnl_pct):
+        """Append one closed trade to the columnar trade store."""
+        trades = self.trades
+        trades['symbol'].append(symbol)
+        trades['entry_date'].append(entry_date)
+        trades['exit_date'].append(exit_date)
+        trades['entry_price'].append(entry_price)
+        trades['exit_price'].append(exit_price)
+        trades['shares'].append(shares)
+        trades['pnl'].append(pnl)
+        trades['pnl_pct'].append(pnl_pct)
+
     def _open_position(self, symbol: str, price: float, date):
         """Open a new position."""
-        # Calculate position size
-        shares = self.strategy.calculate_position_size(symbol, price, self.capital)
-        
+        idx = self._sym_idx[symbol]
+        if self._open_mask[idx]:
+            return
+
+        # Calculate position size, clamped to what capital can cover:
+        # one division, one multiplication, no recompute on the
+        # overflow path
+        cap = self.capital
+        shares = self.strategy.calculate_position_size(symbol, price, cap)
+        shares = min(shares, int(cap // price))
+
         if shares <= 0:
             return
-        
+
         cost = shares * price
-        
-        if cost > self.capital:
-            shares = int(self.capital / price)
-            cost = shares * price
-        
-        if shares > 0:
-            self.positions[symbol] = {
-                'shares': shares,
-                'entry_price': price,
-                'entry_date': date,
-                'cost': cost
-            }
-            self.capital -= cost
-            
-            logger.info(f"BUY: {shares} shares of {symbol} at ${price:.2f} on {date}")
-    
+
+        self._shares[idx] = shares
+        self._entry_price[idx] = price
+        self._cost[idx] = cost
+        self._entry_dates[idx] = date
+        self._open_mask[idx] = True
+        self.capital = cap - cost
+
+        logger.info(f"BUY: {shares} shares of {symbol} at ${price:.2f} on {date}")
+
     def _close_position(self, symbol: str, price: float, date):
         """Close an existing position."""
-        if symbol not in self.positions:
+        idx = self._sym_idx[symbol]
+        if not self._open_mask[idx]:
             return
-        
-        position = self.positions[symbol]
-        shares = position['shares']
-        entry_price = position['entry_price']
-        
+
+        shares = int(self._shares[idx])
+        entry_price = self._entry_price[idx]
+
         proceeds = shares * price
         self.capital += proceeds
-        
-        pnl = proceeds - position['cost']
+
+        pnl = proceeds - self._cost[idx]
         pnl_pct = (price - entry_price) / entry_price * 100
-        
+
         # Record trade
-        self.trades.append({
-            'symbol': symbol,
-            'entry_date': position['entry_date'],
-            'exit_date': date,
-            'entry_price': entry_price,
-            'exit_price': price,
-            'shares': shares,
-            'pnl': pnl,
-            'pnl_pct': pnl_pct
-        })
-        
+        self._record_trade(symbol, self._entry_dates[idx], date,
+                           entry_price, price, shares, pnl, pnl_pct)
+
         logger.info(f"SELL: {shares} shares of {symbol} at ${price:.2f} on {date}, P&L: ${pnl:.2f} ({pnl_pct:.2f}%)")
-        
-        del self.positions[symbol]
-    
-    def _calculate_portfolio_value(self, current_data) -> float:
-        """Calculate current portfolio value."""
-        value = self.capital
-        
-        for symbol, position in self.positions.items():
-            if 'Close' in current_data:
-                current_price = current_data['Close']
-                value += position['shares'] * current_price
-        
-        return value
+
+        self._shares[idx] = 0
+        self._entry_price[idx] = 0.0
+        self._cost[idx] = 0.0
+        self._entry_dates[idx] = None
+        self._open_mask[idx] = False
+
+    def _calculate_portfolio_value(self, current_prices: np.ndarray) -> float:
+        """
+        Calculate current portfolio value.
+
+        Args:
+            current_prices: price per symbol, aligned to the symbol order
+                passed to run_backtest
+        """
+        return self.capital + float((self._shares * current_prices).sum())
     
     def _calculate_results(self) -> Dict:
         """Calculate backtest performance metrics."""
-        if not self.trades:
+        if not self.trades['pnl']:
             return {
                 'total_trades': 0,
                 'total_return': 0,
@@ -172,36 +249,33 @@ class Backtester:
                 'sharpe_ratio': 0
             }
         
-        trades_df = pd.DataFrame(self.trades)
-        
-        # Basic metrics
-        total_trades = len(trades_df)
-        winning_trades = len(trades_df[trades_df['pnl'] > 0])
-        losing_trades = len(trades_df[trades_df['pnl'] < 0])
-        
+        # Single numpy pass over the P&L column - the columnar trade
+        # store converts to an array without any per-dict extraction
+        pnl = np.asarray(self.trades['pnl'], dtype=np.float64)
+        winning_mask = pnl > 0
+        losing_mask = pnl < 0
+
+        total_trades = len(pnl)
+        winning_trades = int(winning_mask.sum())
+        losing_trades = int(losing_mask.sum())
+
         total_return = self.capital - self.initial_capital
         total_return_pct = (total_return / self.initial_capital) * 100
-        
+
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        avg_win = trades_df[trades_df['pnl'] > 0]['pnl'].mean() if winning_trades > 0 else 0
-        avg_loss = trades_df[trades_df['pnl'] < 0]['pnl'].mean() if losing_trades > 0 else 0
-        
-        # Calculate max drawdown
-        equity_df = pd.DataFrame(self.equity_curve)
-        if not equity_df.empty:
-            cummax = equity_df['value'].cummax()
-            drawdown = (equity_df['value'] - cummax) / cummax
-            max_drawdown = drawdown.min() * 100
-        else:
-            max_drawdown = 0
-        
-        # Sharpe ratio (simplified)
-        if not equity_df.empty and len(equity_df) > 1:
-            returns = equity_df['value'].pct_change().dropna()
-            sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() > 0 else 0
+
+        avg_win = float(pnl[winning_mask].mean()) if winning_trades > 0 else 0
+        avg_loss = float(pnl[losing_mask].mean()) if losing_trades > 0 else 0
+
+        # Max drawdown and Sharpe from one fused pass over the equity
+        # values (running peak + Welford return stats in _sim_core)
+        if self._equity_values:
+            values = np.concatenate(self._equity_values)
         else:
-            sharpe_ratio = 0
+            values = np.empty(0)
+        max_dd, mean_ret, std_ret = equity_metrics(values)
+        max_drawdown = float(max_dd * 100)
+        sharpe_ratio = float((mean_ret / std_ret) * np.sqrt(252)) if std_ret > 0 else 0
         
         return {
             'total_trades': total_trades,
@@ -218,19 +292,46 @@ class Backtester:
         }
     
     def _print_results(self, results: Dict):
-        """Print backtest results in a formatted way."""
-        print("\n" + "="*60)
-        print(f"BACKTEST RESULTS - {self.strategy.name} Strategy")
-        print("="*60)
-        print(f"Initial Capital:    ${self.initial_capital:,.2f}")
-        print(f"Final Capital:      ${results['final_capital']:,.2f}")
-        print(f"Total Return:       ${results['total_return']:,.2f} ({results['total_return_pct']:.2f}%)")
-        print(f"Total Trades:       {results['total_trades']}")
-        print(f"Winning Trades:     {results['winning_trades']}")
-        print(f"Losing Trades:      {results['losing_trades']}")
-        print(f"Win Rate:           {results['win_rate']:.2f}%")
-        print(f"Average Win:        ${results['avg_win']:.2f}")
-        print(f"Average Loss:       ${results['avg_loss']:.2f}")
-        print(f"Max Drawdown:       {results['max_drawdown']:.2f}%")
-        print(f"Sharpe Ratio:       {results['sharpe_ratio']:.2f}")
-        print("="*60 + "\n")
+        """Print backtest results in a formatted way.
+
+        Writes the whole report as one buffer (a single flush) and skips
+        it entirely when verbose is off, so parameter sweeps that call
+        run_backtest in a loop don't pay for terminal I/O.
+        """
+        if not self.verbose:
+            return
+
+        rule = "=" * 60
+        report = (
+            f"\n{rule}\n"
+            f"BACKTEST RESULTS - {self.strategy.name} Strategy\n"
+            f"{rule}\n"
+            f"Initial Capital:    ${self.initial_capital:,.2f}\n"
+            f"Final Capital:      ${results['final_capital']:,.2f}\n"
+            f"Total Return:       ${results['total_return']:,.2f} ({results['total_return_pct']:.2f}%)\n"
+            f"Total Trades:       {results['total_trades']}\n"
+            f"Winning Trades:     {results['winning_trades']}\n"
+            f"Losing Trades:      {results['losing_trades']}\n"
+            f"Win Rate:           {results['win_rate']:.2f}%\n"
+            f"Average Win:        ${results['avg_win']:.2f}\n"
+            f"Average Loss:       ${results['avg_loss']:.2f}\n"
+            f"Max Drawdown:       {results['max_drawdown']:.2f}%\n"
+            f"Sharpe Ratio:       {results['sharpe_ratio']:.2f}\n"
+            f"{rule}\n\n"
+        )
+        sys.stdout.write(report)
+
+
+def _backtest_symbol_worker(args):
+    """Run one symbol's backtest in a fresh Backtester (process pool entry).
+
+    Module-level so it is picklable; returns the columnar trades, equity
+    buffers and final capital for the parent process to merge.
+    """
+    strategy_name, symbol, start_date, end_date, capital_share = args
+    backtester = Backtester(strategy_name, initial_capital=capital_share)
+    backtester._sym_idx = {symbol: 0}
+    backtester._allocate_position_state(1)
+    backtester._backtest_symbol(symbol, start_date, end_date)
+    return (backtester.trades, backtester._equity_dates,
+            backtester._equity_values, backtester.capital)
@@ -3,37 +3,58 @@ Broker integration module for order execution.
 Supports Alpaca and can be extended for other brokers.
 """
 import logging
+import threading
 from typing import Dict, List, Optional
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest, LimitOrderRequest
-from alpaca.trading.enums import OrderSide, TimeInForce, OrderType
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockLatestQuoteRequest
 from config import Config
 
+# The alpaca.* trees are heavy to import (pydantic models, msgpack,
+# websockets); defer them to first client use so short-lived scripts
+# that import this module start fast.
+
 logger = logging.getLogger(__name__)
 
+# The Alpaca clients hold a connection pool and parsed auth config, so
+# build them once per process and share across BrokerInterface instances
+# (scripts like check_positions.py re-instantiate the interface per run).
+_clients_lock = threading.Lock()
+_trading_client = None
+_data_client = None
+
+
+def _get_clients():
+    """Return the shared (TradingClient, StockHistoricalDataClient) pair."""
+    global _trading_client, _data_client
+    if _trading_client is None:
+        with _clients_lock:
+            if _trading_client is None:
+                from alpaca.trading.client import TradingClient
+                from alpaca.data.historical import StockHistoricalDataClient
+
+                _data_client = StockHistoricalDataClient(
+                    Config.ALPACA_API_KEY,
+                    Config.ALPACA_SECRET_KEY
+                )
+                _trading_client = TradingClient(
+                    Config.ALPACA_API_KEY,
+                    Config.ALPACA_SECRET_KEY,
+                    paper=Config.is_paper_trading()
+                )
+                logger.info(f"Initialized Alpaca client (Paper Trading: {Config.is_paper_trading()})")
+    return _trading_client, _data_client
+
+
 class BrokerInterface:
     """Interface for broker operations."""
-    
+
     def __init__(self):
         self.client = None
         self.data_client = None
         self._initialize_clients()
-    
+
     def _initialize_clients(self):
-        """Initialize Alpaca trading and data clients."""
+        """Attach the process-wide Alpaca trading and data clients."""
         try:
-            self.client = TradingClient(
-                Config.ALPACA_API_KEY,
-                Config.ALPACA_SECRET_KEY,
-                paper=Config.is_paper_trading()
-            )
-            self.data_client = StockHistoricalDataClient(
-                Config.ALPACA_API_KEY,
-                Config.ALPACA_SECRET_KEY
-            )
-            logger.info(f"Initialized Alpaca client (Paper Trading: {Config.is_paper_trading()})")
+            self.client, self.data_client = _get_clients()
         except Exception as e:
             logger.error(f"Failed to initialize broker clients: {e}")
             raise
@@ -83,8 +104,11 @@ class BrokerInterface:
             side: 'buy' or 'sell'
         """
         try:
+            from alpaca.trading.requests import MarketOrderRequest
+            from alpaca.trading.enums import OrderSide, TimeInForce
+
             order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
-            
+
             market_order_data = MarketOrderRequest(
                 symbol=symbol,
                 qty=qty,
@@ -113,8 +137,11 @@ class BrokerInterface:
                          limit_price: float) -> Optional[Dict]:
         """Place a limit order."""
         try:
+            from alpaca.trading.requests import LimitOrderRequest
+            from alpaca.trading.enums import OrderSide, TimeInForce
+
             order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
-            
+
             limit_order_data = LimitOrderRequest(
                 symbol=symbol,
                 qty=qty,
@@ -187,19 +214,24 @@ class BrokerInterface:
             logger.error(f"Error closing all positions: {e}")
             return False
     
-    def get_latest_quote(self, symbol: str) -> Optional[Dict]:
-        """Get the latest quote for a symbol."""
+    def get_latest_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get the latest quotes for several symbols in one API call."""
         try:
-            request = StockLatestQuoteRequest(symbol_or_symbols=symbol)
+            from alpaca.data.requests import StockLatestQuoteRequest
+
+            request = StockLatestQuoteRequest(symbol_or_symbols=symbols)
             quotes = self.data_client.get_stock_latest_quote(request)
-            quote = quotes[symbol]
-            
-            return {
+
+            return {symbol: {
                 'ask_price': float(quote.ask_price),
                 'bid_price': float(quote.bid_price),
                 'ask_size': quote.ask_size,
                 'bid_size': quote.bid_size
-            }
+            } for symbol, quote in quotes.items()}
         except Exception as e:
-            logger.error(f"Error fetching quote for {symbol}: {e}")
-            return None
+            logger.error(f"Error fetching quotes for {symbols}: {e}")
+            return {}
+
+    def get_latest_quote(self, symbol: str) -> Optional[Dict]:
+        """Get the latest quote for a symbol."""
+        return self.get_latest_quotes([symbol]).get(symbol)
@@ -6,78 +6,134 @@ Uses FREE CoinGecko API
 
 import os
 import json
+import time
+import functools
 import requests
+from bisect import bisect_left
+
+# orjson parses the CoinGecko payloads several times faster than the
+# stdlib; fall back transparently when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 import logging
 
+# Threshold tables for _analyze_crypto_trends: one bisect into the bins
+# replaces the if/elif cascade over 24h and 7d price changes
+_BTC_24H_BINS = (-5.0, -2.0, 2.0, 5.0)
+_BTC_24H_SIGNALS = ('RISK_OFF', 'RISK_OFF', 'NEUTRAL', 'RISK_ON', 'RISK_ON')
+_BTC_24H_CONFIDENCE = (30, 15, 0, 15, 30)
+_BTC_24H_REASONS = (
+    'Bitcoin down {0:.1f}% (24h)',
+    'Bitcoin falling ({0:.1f}%)',
+    None,
+    'Bitcoin rising ({0:.1f}%)',
+    'Bitcoin up {0:.1f}% (24h)'
+)
+
+_BTC_7D_BINS = (-10.0, 10.0)
+_BTC_7D_CONFIDENCE = (20, 0, 20)
+_BTC_7D_REASONS = (
+    'Weak 7-day trend ({0:.1f}%)',
+    None,
+    'Strong 7-day rally ({0:.1f}%)'
+)
+
+
+def ttl_cache(seconds):
+    """Memoize a function's result for `seconds`, keyed on its args.
+
+    Replaces the hand-rolled (timestamp, value) cache dict; uses the
+    monotonic clock so wall-clock adjustments can't expire or pin
+    entries. Note that error fallbacks are cached too, which doubles as
+    a backoff against hammering the free CoinGecko tier while it is
+    failing or rate limiting.
+    """
+    def decorator(fn):
+        cache = {}
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            value = fn(*args)
+            cache[args] = (now, value)
+            return value
+        return wrapper
+    return decorator
+
 class CryptoCorrelationTracker:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
         # CoinGecko API (free, no key required)
         self.base_url = "https://api.coingecko.com/api/v3"
-        
-        self.cache = {}
-        self.cache_duration = 600  # 10 minutes
-        
+
+        # Reuse one session so repeated polls keep the TCP/TLS connection
+        self.session = requests.Session()
+
         # Key crypto to track
         self.crypto_ids = {
             'bitcoin': 'BTC',
             'ethereum': 'ETH'
         }
     
+    @ttl_cache(600)  # 10 minutes
     def get_crypto_sentiment(self) -> Dict:
         """
         Analyze crypto market sentiment
         Crypto often leads stock market moves (risk-on/risk-off)
         """
-        cache_key = "crypto_sentiment"
-        now = datetime.now()
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_time, cached_data = self.cache[cache_key]
-            if (now - cached_time).total_seconds() < self.cache_duration:
-                return cached_data
-        
         try:
-            # Get Bitcoin and Ethereum data
-            btc_data = self._get_crypto_data('bitcoin')
-            eth_data = self._get_crypto_data('ethereum')
-            
+            # Get Bitcoin and Ethereum data in one batched request
+            prices = self._get_prices_batch(tuple(self.crypto_ids.keys()))
+            btc_data = prices.get('bitcoin')
+            eth_data = prices.get('ethereum')
+
             # Analyze sentiment
-            analysis = self._analyze_crypto_trends(btc_data, eth_data)
-            
-            # Cache result
-            self.cache[cache_key] = (now, analysis)
-            return analysis
-            
+            return self._analyze_crypto_trends(btc_data, eth_data)
+
         except Exception as e:
             self.logger.error(f"Error analyzing crypto sentiment: {e}")
             return self._empty_response()
-    
-    def _get_crypto_data(self, crypto_id: str) -> Optional[Dict]:
-        """Fetch crypto data from CoinGecko"""
+
+    @ttl_cache(600)
+    def _get_prices_batch(self, crypto_ids: tuple) -> Dict[str, Dict]:
+        """
+        Fetch 24h/7d price changes for several coins in one request.
+
+        Uses the lightweight /coins/markets endpoint instead of one heavy
+        /coins/{id} call per coin - one round trip, ~100x smaller payload.
+        """
         try:
-            url = f"{self.base_url}/coins/{crypto_id}"
+            url = f"{self.base_url}/coins/markets"
             params = {
-                'localization': 'false',
-                'tickers': 'false',
-                'market_data': 'true',
-                'community_data': 'false',
-                'developer_data': 'false'
+                'vs_currency': 'usd',
+                'ids': ','.join(crypto_ids),
+                'price_change_percentage': '24h,7d'
+            }
+
+            resp = self.session.get(url, params=params, timeout=10)
+            if resp.status_code != 200:
+                return {}
+
+            return {
+                coin['id']: {
+                    'price_change_24h': coin.get('price_change_percentage_24h') or 0,
+                    'price_change_7d': coin.get('price_change_percentage_7d_in_currency') or 0
+                }
+                for coin in _loads(resp.content)
             }
-            
-            resp = requests.get(url, params=params, timeout=10)
-            if resp.status_code == 200:
-                return resp.json()
-            
-            return None
-            
+
         except Exception as e:
-            self.logger.error(f"Error fetching {crypto_id}: {e}")
-            return None
+            self.logger.error(f"Error fetching crypto prices: {e}")
+            return {}
     
     def _analyze_crypto_trends(self, btc_data: Optional[Dict], 
                                eth_data: Optional[Dict]) -> Dict:
@@ -93,40 +149,27 @@ class CryptoCorrelationTracker:
         
         if not btc_data:
             return self._empty_response()
+
+        # Extract market data (flat shape from _get_prices_batch)
+        btc_price_change_24h = btc_data.get('price_change_24h', 0)
+        btc_price_change_7d = btc_data.get('price_change_7d', 0)
+
+        eth_price_change_24h = eth_data.get('price_change_24h', 0) if eth_data else 0
         
-        # Extract market data
-        btc_market = btc_data.get('market_data', {})
-        btc_price_change_24h = btc_market.get('price_change_percentage_24h', 0)
-        btc_price_change_7d = btc_market.get('price_change_percentage_7d', 0)
-        
-        eth_market = eth_data.get('market_data', {}) if eth_data else {}
-        eth_price_change_24h = eth_market.get('price_change_percentage_24h', 0)
-        
-        # Bitcoin trend
-        if btc_price_change_24h > 5:
-            signal = "RISK_ON"
-            confidence += 30
-            reasons.append(f"Bitcoin up {btc_price_change_24h:.1f}% (24h)")
-        elif btc_price_change_24h > 2:
-            signal = "RISK_ON"
-            confidence += 15
-            reasons.append(f"Bitcoin rising ({btc_price_change_24h:.1f}%)")
-        elif btc_price_change_24h < -5:
-            signal = "RISK_OFF"
-            confidence += 30
-            reasons.append(f"Bitcoin down {btc_price_change_24h:.1f}% (24h)")
-        elif btc_price_change_24h < -2:
-            signal = "RISK_OFF"
-            confidence += 15
-            reasons.append(f"Bitcoin falling ({btc_price_change_24h:.1f}%)")
-        
+        # Bitcoin trend: threshold table lookup instead of branch cascade
+        idx = bisect_left(_BTC_24H_BINS, btc_price_change_24h)
+        signal = _BTC_24H_SIGNALS[idx]
+        confidence += _BTC_24H_CONFIDENCE[idx]
+        reason = _BTC_24H_REASONS[idx]
+        if reason:
+            reasons.append(reason.format(btc_price_change_24h))
+
         # 7-day trend
-        if btc_price_change_7d > 10:
-            confidence += 20
-            reasons.append(f"Strong 7-day rally ({btc_price_change_7d:.1f}%)")
-        elif btc_price_change_7d < -10:
-            confidence += 20
-            reasons.append(f"Weak 7-day trend ({btc_price_change_7d:.1f}%)")
+        idx = bisect_left(_BTC_7D_BINS, btc_price_change_7d)
+        confidence += _BTC_7D_CONFIDENCE[idx]
+        reason = _BTC_7D_REASONS[idx]
+        if reason:
+            reasons.append(reason.format(btc_price_change_7d))
         
         # Ethereum confirmation
         if eth_price_change_24h:
@@ -2,27 +2,93 @@
 Market data fetching and management module.
 Handles real-time and historical data from multiple sources.
 """
+import os
+import time
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
 from typing import Dict, List, Optional
 import logging
 
+# TA-Lib's C single-pass implementations are several times faster than
+# the equivalent pandas rolling chains; fall back to pandas when it is
+# not installed (it needs a separate native build).
+try:
+    import talib
+    USE_TALIB = True
+except ImportError:
+    USE_TALIB = False
+
+# Numba-compiled fused pipeline: second choice after TA-Lib, still far
+# faster than the pandas rolling chain
+from _njit import HAVE_NUMBA
+from indicators_numba import compute_indicators
+
 logger = logging.getLogger(__name__)
 
+# Market-hours constants, built once: get_market_status runs on hot
+# paths and shouldn't allocate a timezone or parse time strings per call
+_ET = ZoneInfo('America/New_York')
+_MARKET_OPEN = dt_time(9, 30)
+_MARKET_CLOSE = dt_time(16, 0)
+
+
+def _sma_from_cumsum(csum: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean from a shared cumulative sum; NaN before a full window."""
+    out = np.full(csum.shape, np.nan)
+    if csum.shape[0] >= window:
+        out[window - 1] = csum[window - 1] / window
+        out[window:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """O(N) rolling mean via cumulative sums; NaN before a full window."""
+    return _sma_from_cumsum(np.cumsum(values, dtype=np.float64), window)
+
+
 class MarketData:
     """Handles fetching and caching market data."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: str = 'data_cache'):
         self.cache = {}
         self.cache_duration = timedelta(minutes=1)
+        # Historical bars change slowly; cache them longer so repeated
+        # backtests and parameter sweeps skip the refetch entirely.
+        self.history_cache_duration = timedelta(minutes=30)
+        # On-disk Parquet layer under the in-memory cache, so history
+        # survives across processes (example runs, sweeps, restarts)
+        self.cache_dir = cache_dir
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not create cache dir {self.cache_dir}: {e}")
+            self.cache_dir = None
+
+    def _history_cache_path(self, symbol: str, period: str, interval: str) -> Optional[str]:
+        """Path of the on-disk Parquet cache entry for these args."""
+        if self.cache_dir is None:
+            return None
+        name = f"{symbol}_{period}_{interval}".replace('/', '_')
+        return os.path.join(self.cache_dir, f"{name}.parquet")
     
-    def get_realtime_price(self, symbol: str) -> Optional[float]:
-        """Get current market price for a symbol."""
+    def get_realtime_price(self, symbol: str,
+                           data: Optional[pd.DataFrame] = None) -> Optional[float]:
+        """
+        Get current market price for a symbol.
+
+        Args:
+            symbol: Stock ticker symbol
+            data: Optional pre-fetched intraday frame with a Close
+                column, so batch callers avoid a second download
+        """
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period='1d', interval='1m')
+            if data is None:
+                ticker = yf.Ticker(symbol)
+                data = ticker.history(period='1d', interval='1m')
             if not data.empty:
                 return data['Close'].iloc[-1]
             return None
@@ -40,32 +106,161 @@ class MarketData:
             period: Data period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
             interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
         """
+        cache_key = ('history', symbol, period, interval)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached_time, cached_data = cached
+            if datetime.now() - cached_time < self.history_cache_duration:
+                # Copy so callers adding indicator columns don't poison the cache
+                return cached_data.copy()
+
+        # Disk layer: fresh-enough Parquet file beats a refetch
+        path = self._history_cache_path(symbol, period, interval)
+        if path is not None and os.path.exists(path):
+            try:
+                age = time.time() - os.path.getmtime(path)
+                if age < self.history_cache_duration.total_seconds():
+                    data = pd.read_parquet(path)
+                    self.cache[cache_key] = (datetime.now(), data.copy())
+                    return data
+            except Exception as e:
+                logger.warning(f"Could not read cached data for {symbol}: {e}")
+
         try:
             ticker = yf.Ticker(symbol)
             data = ticker.history(period=period, interval=interval)
+            if not data.empty:
+                self.cache[cache_key] = (datetime.now(), data.copy())
+                if path is not None:
+                    try:
+                        data.to_parquet(path)
+                    except Exception as e:
+                        logger.warning(f"Could not cache data for {symbol}: {e}")
             return data
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return pd.DataFrame()
     
     def get_multiple_prices(self, symbols: List[str]) -> Dict[str, float]:
-        """Get current prices for multiple symbols efficiently."""
+        """Get current prices for multiple symbols in one batched download.
+
+        A single yf.download round trip replaces one HTTP request per
+        ticker, so latency stays flat as the watchlist grows.
+        """
+        if not symbols:
+            return {}
+
+        cache_key = ('prices', frozenset(symbols))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached_time, cached_prices = cached
+            if datetime.now() - cached_time < self.cache_duration:
+                return dict(cached_prices)
+
         prices = {}
-        for symbol in symbols:
-            price = self.get_realtime_price(symbol)
-            if price:
-                prices[symbol] = price
+        try:
+            data = yf.download(
+                tickers=' '.join(symbols), period='1d', interval='1m',
+                group_by='ticker', threads=True, progress=False
+            )
+            for symbol in symbols:
+                try:
+                    if isinstance(data.columns, pd.MultiIndex):
+                        closes = data[symbol]['Close'].dropna()
+                    else:
+                        # Single ticker comes back with flat columns
+                        closes = data['Close'].dropna()
+                    if not closes.empty:
+                        prices[symbol] = float(closes.iloc[-1])
+                except KeyError:
+                    logger.warning(f"No price data returned for {symbol}")
+            self.cache[cache_key] = (datetime.now(), dict(prices))
+        except Exception as e:
+            logger.error(f"Error fetching prices for {symbols}: {e}")
         return prices
     
-    def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_technical_indicators(self, df: pd.DataFrame,
+                                       symbol: Optional[str] = None) -> pd.DataFrame:
         """Add common technical indicators to price data."""
         if df.empty:
             return df
-        
-        # Simple Moving Averages
-        df['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50).mean()
-        df['SMA_200'] = df['Close'].rolling(window=200).mean()
+
+        # Memoize on a cheap fingerprint of the frame so repeated
+        # backtests over the same bars don't recompute every indicator.
+        # The symbol is part of the key: watchlist frames fetched over
+        # the same period share length and index bounds, and the last
+        # close alone is not a safe discriminator
+        fingerprint = ('indicators', symbol, len(df), df.index[0],
+                       df.index[-1], float(df['Close'].iloc[-1]))
+        cached = self.cache.get(fingerprint)
+        if cached is not None:
+            return cached.copy()
+
+        if USE_TALIB:
+            self._add_indicators_talib(df)
+        elif HAVE_NUMBA:
+            self._add_indicators_numba(df)
+        else:
+            self._add_indicators_pandas(df)
+
+        self.cache[fingerprint] = df.copy()
+        return df
+
+    def _add_indicators_talib(self, df: pd.DataFrame):
+        """Compute the indicator columns with TA-Lib's C implementations."""
+        close = df['Close'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+
+        df['SMA_20'] = talib.SMA(close, timeperiod=20)
+        df['SMA_50'] = talib.SMA(close, timeperiod=50)
+        df['SMA_200'] = talib.SMA(close, timeperiod=200)
+
+        df['EMA_12'] = talib.EMA(close, timeperiod=12)
+        df['EMA_26'] = talib.EMA(close, timeperiod=26)
+
+        macd, macd_signal, macd_hist = talib.MACD(
+            close, fastperiod=12, slowperiod=26, signalperiod=9)
+        df['MACD'] = macd
+        df['MACD_Signal'] = macd_signal
+        df['MACD_Hist'] = macd_hist
+
+        df['RSI'] = talib.RSI(close, timeperiod=14)
+
+        bb_upper, bb_middle, bb_lower = talib.BBANDS(
+            close, timeperiod=20, nbdevup=2, nbdevdn=2)
+        df['BB_Middle'] = bb_middle
+        df['BB_Upper'] = bb_upper
+        df['BB_Lower'] = bb_lower
+
+        df['Volume_MA'] = talib.SMA(volume, timeperiod=20)
+
+        df['ATR'] = talib.ATR(high, low, close, timeperiod=14)
+
+    def _add_indicators_numba(self, df: pd.DataFrame):
+        """Compute the indicator columns with the fused numba pipeline."""
+        (df['SMA_20'], df['SMA_50'], df['SMA_200'],
+         df['EMA_12'], df['EMA_26'],
+         df['MACD'], df['MACD_Signal'], df['MACD_Hist'],
+         df['RSI'],
+         df['BB_Middle'], df['BB_Upper'], df['BB_Lower'],
+         df['Volume_MA'], df['ATR']) = compute_indicators(
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            df['Close'].to_numpy(dtype=np.float64),
+            df['Volume'].to_numpy(dtype=np.float64)
+        )
+
+    def _add_indicators_pandas(self, df: pd.DataFrame):
+        """Compute the indicator columns with pandas (TA-Lib unavailable)."""
+        # Simple Moving Averages share one cumulative sum of Close -
+        # each becomes a subtraction and divide instead of a rolling
+        # scan (SMA_20 falls out of the Bollinger window below)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        close_csum = np.cumsum(close, dtype=np.float64)
+        df['SMA_50'] = _sma_from_cumsum(close_csum, 50)
+        df['SMA_200'] = _sma_from_cumsum(close_csum, 200)
         
         # Exponential Moving Averages
         df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
@@ -76,48 +271,57 @@ class MarketData:
         df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
         df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
         
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
+        # RSI - raw numpy arrays skip the Series.where/rolling chain and
+        # its intermediate allocations
+        delta = np.diff(close, prepend=close[:1])
+        gain = _rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+        loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
         df['RSI'] = 100 - (100 / (1 + rs))
         
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
+        # Bollinger Bands: one strided window view feeds both the mean
+        # and the std, replacing two pandas rolling scans of Close; the
+        # window mean doubles as SMA_20
+        n = close.shape[0]
+        bb_middle = np.full(n, np.nan)
+        bb_upper = np.full(n, np.nan)
+        bb_lower = np.full(n, np.nan)
+        if n >= 20:
+            windows = sliding_window_view(close, 20)
+            mean = windows.mean(axis=1)
+            dev2 = 2 * windows.std(axis=1, ddof=1)
+            bb_middle[19:] = mean
+            bb_upper[19:] = mean + dev2
+            bb_lower[19:] = mean - dev2
+        df['SMA_20'] = bb_middle
+        df['BB_Middle'] = bb_middle
+        df['BB_Upper'] = bb_upper
+        df['BB_Lower'] = bb_lower
         
         # Volume Moving Average
-        df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
-        
-        # ATR (Average True Range) for volatility
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        df['ATR'] = true_range.rolling(14).mean()
+        df['Volume_MA'] = _rolling_mean(
+            df['Volume'].to_numpy(dtype=np.float64), 20)
         
-        return df
-    
+        # ATR (Average True Range) for volatility: elementwise maxima on
+        # contiguous arrays instead of a concat + row-wise DataFrame max.
+        # fmax skips the leading NaN the way DataFrame.max(skipna) did.
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(high - low,
+                             np.fmax(np.abs(high - prev_close),
+                                     np.abs(low - prev_close)))
+        df['ATR'] = _rolling_mean(true_range, 14)
+
     def get_market_status(self) -> Dict[str, bool]:
         """Check if market is currently open."""
-        from datetime import datetime
-        import pytz
-        
-        # US Eastern Time
-        et = pytz.timezone('America/New_York')
-        now = datetime.now(et)
-        
         # Market hours: 9:30 AM - 4:00 PM ET, Monday-Friday
+        now = datetime.now(_ET)
         is_weekday = now.weekday() < 5
-        market_open = now.time() >= datetime.strptime('09:30', '%H:%M').time()
-        market_close = now.time() <= datetime.strptime('16:00', '%H:%M').time()
-        
+
         return {
-            'is_open': is_weekday and market_open and market_close,
+            'is_open': is_weekday and _MARKET_OPEN <= now.time() <= _MARKET_CLOSE,
             'is_weekday': is_weekday,
             'current_time': now
         }
@@ -1,9 +1,12 @@
 """
 Database module for storing and retrieving trading data.
 """
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean
+from sqlalchemy import (create_engine, event, select, Column, Integer, Float,
+                        String, DateTime, Boolean, Index)
+import pandas as pd
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from contextlib import contextmanager
 from datetime import datetime
 import logging
 from config import Config
@@ -15,9 +18,12 @@ Base = declarative_base()
 class Trade(Base):
     """Trade record model."""
     __tablename__ = 'trades'
-    
+    # get_open_trades and get_trades_by_symbol filter on these; the
+    # composite index covers the open-trades-for-symbol pattern
+    __table_args__ = (Index('ix_trades_status_symbol', 'status', 'symbol'),)
+
     id = Column(Integer, primary_key=True)
-    symbol = Column(String(10), nullable=False)
+    symbol = Column(String(10), nullable=False, index=True)
     side = Column(String(4), nullable=False)  # BUY or SELL
     quantity = Column(Float, nullable=False)
     entry_price = Column(Float, nullable=False)
@@ -27,13 +33,16 @@ class Trade(Base):
     pnl = Column(Float, nullable=True)
     pnl_pct = Column(Float, nullable=True)
     strategy = Column(String(50), nullable=False)
-    status = Column(String(20), nullable=False)  # OPEN, CLOSED, CANCELLED
+    status = Column(String(20), nullable=False, index=True)  # OPEN, CLOSED, CANCELLED
     created_at = Column(DateTime, default=datetime.now)
 
 class Portfolio(Base):
     """Portfolio snapshot model."""
     __tablename__ = 'portfolio'
-    
+    # History queries range-scan on timestamp; index keeps them
+    # O(log n + k) as snapshots accumulate
+    __table_args__ = (Index('ix_portfolio_timestamp', 'timestamp'),)
+
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, nullable=False, default=datetime.now)
     total_value = Column(Float, nullable=False)
@@ -47,20 +56,102 @@ class Database:
     
     def __init__(self, db_url: str = None):
         self.db_url = db_url or Config.DATABASE_URL
-        self.engine = create_engine(self.db_url)
+        # Size the pool for concurrent callers (trading loop, dashboard,
+        # scheduler); SQLite instead just needs cross-thread access
+        connect_args = {}
+        engine_kwargs = {'pool_pre_ping': True}
+        if self.db_url.startswith('sqlite'):
+            connect_args['check_same_thread'] = False
+        else:
+            engine_kwargs.update(pool_size=16, max_overflow=32)
+        self.engine = create_engine(self.db_url, connect_args=connect_args,
+                                    **engine_kwargs)
+        if self.db_url.startswith('sqlite'):
+            # WAL lets readers run during writes and NORMAL sync cuts
+            # the fsync per commit; applied to every new connection
+            @event.listens_for(self.engine, 'connect')
+            def _set_sqlite_pragmas(dbapi_conn, _record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+                cursor.close()
         Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        # scoped_session hands each thread its own session while keeping
+        # the familiar self.session.query(...) call sites working
+        self.session = scoped_session(sessionmaker(bind=self.engine))
+        # Write buffer for the hot save path: trades queue up here and
+        # land in one Core insert per batch (reads flush first, so
+        # callers never see stale results)
+        self._trade_buffer = []
+        self._trade_buffer_max = 500
+        self._in_transaction = False
         logger.info(f"Database initialized: {self.db_url}")
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes under one commit.
+
+        While the block is open, save_* methods defer their commits so
+        a burst of writes costs one fsync instead of one each.
+        """
+        self._in_transaction = True
+        try:
+            yield self.session
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self._in_transaction = False
     
-    def save_trade(self, trade_data: dict) -> Trade:
-        """Save a trade to the database."""
-        trade = Trade(**trade_data)
-        self.session.add(trade)
-        self.session.commit()
-        logger.info(f"Trade saved: {trade.symbol} - {trade.side}")
-        return trade
+    def save_trade(self, trade_data: dict):
+        """Queue a trade for insertion; batches flush through Core."""
+        self._trade_buffer.append(trade_data)
+        logger.info(f"Trade queued: {trade_data.get('symbol')} - {trade_data.get('side')}")
+        if len(self._trade_buffer) >= self._trade_buffer_max:
+            self.flush_trades()
+
+    def flush_trades(self):
+        """Write buffered trades in a single Core transaction."""
+        if not self._trade_buffer:
+            return
+        rows, self._trade_buffer = self._trade_buffer, []
+        self.save_trades_core(rows)
+
+    def save_trades_core(self, rows: list):
+        """Insert trade rows through Core, bypassing ORM flush overhead.
+
+        No identity map, no unit-of-work sorting - one executemany
+        inside one transaction, which is the fastest ingest path
+        SQLAlchemy offers for plain dict rows.
+        """
+        if not rows:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(Trade.__table__.insert(), rows)
+        logger.info(f"Saved {len(rows)} trades")
     
+    def save_trades_bulk(self, trade_dicts: list):
+        """Save many trades in a single transaction.
+
+        bulk_insert_mappings skips ORM object construction and batches
+        the INSERTs, so one commit (one fsync on SQLite) covers the
+        whole backtest instead of one per trade.
+        """
+        if not trade_dicts:
+            return
+        self.session.bulk_insert_mappings(Trade, trade_dicts)
+        self.session.commit()
+        logger.info(f"Saved {len(trade_dicts)} trades in bulk")
+
+    def save_portfolio_snapshots_bulk(self, snapshot_dicts: list):
+        """Save many portfolio snapshots in a single transaction."""
+        if not snapshot_dicts:
+            return
+        self.session.bulk_insert_mappings(Portfolio, snapshot_dicts)
+        self.session.commit()
+        logger.info(f"Saved {len(snapshot_dicts)} portfolio snapshots in bulk")
+
     def update_trade(self, trade_id: int, **kwargs):
         """Update a trade record."""
         trade = self.session.query(Trade).filter_by(id=trade_id).first()
@@ -72,28 +163,45 @@ class Database:
     
     def get_open_trades(self):
         """Get all open trades."""
+        self.flush_trades()
         return self.session.query(Trade).filter_by(status='OPEN').all()
-    
+
     def get_trades_by_symbol(self, symbol: str):
         """Get all trades for a symbol."""
+        self.flush_trades()
         return self.session.query(Trade).filter_by(symbol=symbol).all()
     
     def save_portfolio_snapshot(self, snapshot_data: dict):
         """Save a portfolio snapshot."""
         snapshot = Portfolio(**snapshot_data)
         self.session.add(snapshot)
-        self.session.commit()
+        if not self._in_transaction:
+            self.session.commit()
     
     def get_latest_portfolio_snapshot(self):
         """Get the most recent portfolio snapshot."""
         return self.session.query(Portfolio).order_by(Portfolio.timestamp.desc()).first()
     
-    def get_portfolio_history(self, days: int = 30):
-        """Get portfolio history for the last N days."""
+    def get_portfolio_history(self, days: int = 30) -> pd.DataFrame:
+        """Get portfolio history for the last N days as a DataFrame.
+
+        Selects the value columns through Core straight into pandas,
+        skipping per-row ORM object construction - for weeks of
+        minute snapshots that is the difference between tens of
+        thousands of Python objects and one typed frame.
+        """
         from datetime import timedelta
         cutoff = datetime.now() - timedelta(days=days)
-        return self.session.query(Portfolio).filter(Portfolio.timestamp >= cutoff).all()
+        cols = Portfolio.__table__.c
+        query = (
+            select(cols.timestamp, cols.total_value, cols.cash,
+                   cols.positions_value, cols.daily_pnl, cols.total_pnl)
+            .where(cols.timestamp >= cutoff)
+            .order_by(cols.timestamp)
+        )
+        return pd.read_sql(query, self.engine)
     
     def close(self):
-        """Close database connection."""
-        self.session.close()
+        """Flush pending writes and close database connections."""
+        self.flush_trades()
+        self.session.remove()
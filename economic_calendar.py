@@ -5,12 +5,23 @@ Uses free economic calendar APIs
 """
 
 import os
+import re
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
 from datetime import datetime, timedelta, time
 from typing import Dict, List, Optional, Tuple
 import logging
 
+# One pooled session for the module: keeps the calendar API connection
+# alive across calls and retries transient failures with backoff
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2)))
+
 class EconomicCalendar:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -19,8 +30,10 @@ class EconomicCalendar:
         self.te_api_key = os.environ.get('TRADING_ECONOMICS_API_KEY', '')
         self.te_base_url = "https://api.tradingeconomics.com"
         
-        self.cache = {}
+        # Bounded TTL cache: entries expire on their own and old days
+        # get evicted, so long-running processes don't leak keys
         self.cache_duration = 3600  # 1 hour
+        self.cache = TTLCache(maxsize=16, ttl=self.cache_duration)
         
         # Major events to track (even without API)
         self.major_events = [
@@ -35,18 +48,39 @@ class EconomicCalendar:
             'Fed Speech',
             'Powell Speech'
         ]
-    
+        # One compiled alternation scans an event name for every major
+        # term at once, instead of a Python substring loop with two
+        # lower() allocations per term
+        self._major_re = re.compile(
+            '|'.join(map(re.escape, self.major_events)), re.IGNORECASE)
+
+        # Precomputed event dates: _get_known_events runs every trading
+        # tick, so two set membership probes beat per-call weekday and
+        # day-range math (and keep the schedule data-driven)
+        self._event_dates_year = datetime.now().year
+        self._nfp_dates, self._cpi_dates = self._build_event_dates(
+            self._event_dates_year)
+
+    @staticmethod
+    def _build_event_dates(year: int):
+        """Precompute NFP Fridays and CPI-week days for a year."""
+        days = [datetime(year, 1, 1).date() + timedelta(days=i)
+                for i in range(366)]
+        days = [d for d in days if d.year == year]
+        nfp = frozenset(d for d in days if d.weekday() == 4 and 1 <= d.day <= 7)
+        cpi = frozenset(d for d in days if 10 <= d.day <= 13)
+        return nfp, cpi
+
     def get_todays_events(self) -> Dict:
         """Get today's major economic events"""
         cache_key = f"events_{datetime.now().date()}"
-        now = datetime.now()
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_time, cached_data = self.cache[cache_key]
-            if (now - cached_time).total_seconds() < self.cache_duration:
-                return cached_data
-        
+
+        # TTLCache handles expiry itself
+        try:
+            return self.cache[cache_key]
+        except KeyError:
+            pass
+
         try:
             # Try API first
             if self.te_api_key:
@@ -54,13 +88,13 @@ class EconomicCalendar:
             else:
                 # Fallback to hardcoded known events
                 events = self._get_known_events()
-            
+
             analysis = self._analyze_events(events)
-            
+
             # Cache result
-            self.cache[cache_key] = (now, analysis)
+            self.cache[cache_key] = analysis
             return analysis
-            
+
         except Exception as e:
             self.logger.error(f"Error fetching economic events: {e}")
             return self._empty_response()
@@ -74,7 +108,7 @@ class EconomicCalendar:
                 'format': 'json'
             }
             
-            resp = requests.get(url, params=params, timeout=10)
+            resp = _SESSION.get(url, params=params, timeout=10)
             if resp.status_code == 200:
                 return resp.json()
             return []
@@ -90,23 +124,27 @@ class EconomicCalendar:
         """
         # This is simplified - in production would track actual dates
         today = datetime.now().date()
-        
+
         # Example: FOMC meetings are typically 8 times per year
         # CPI is first week of each month, NFP is first Friday
-        
+        if today.year != self._event_dates_year:
+            self._event_dates_year = today.year
+            self._nfp_dates, self._cpi_dates = self._build_event_dates(
+                today.year)
+
         events = []
-        
-        # Check if today is first Friday (NFP day)
-        if today.weekday() == 4 and 1 <= today.day <= 7:
+
+        # First Friday (NFP day)
+        if today in self._nfp_dates:
             events.append({
                 'event': 'Non-Farm Payrolls',
                 'importance': 'High',
                 'time': '08:30',
                 'country': 'United States'
             })
-        
-        # Check if today is ~10th-13th (CPI week)
-        if 10 <= today.day <= 13:
+
+        # ~10th-13th (CPI week)
+        if today in self._cpi_dates:
             events.append({
                 'event': 'CPI Report',
                 'importance': 'High',
@@ -127,8 +165,7 @@ class EconomicCalendar:
             importance = event.get('importance', event.get('Importance', 'Low'))
             
             # Check if major event
-            is_major = any(term.lower() in event_name.lower() 
-                          for term in self.major_events)
+            is_major = bool(self._major_re.search(event_name))
             
             if is_major or importance == 'High':
                 major_events.append({
@@ -55,34 +55,54 @@ def check_account_status():
 
 def test_strategy_signals():
     """Example: Test strategy signals on current market data."""
+    from concurrent.futures import ThreadPoolExecutor
+    import pandas as pd
+    import yfinance as yf
     from data_fetcher import MarketData
     from strategies import StrategyFactory
     from config import Config
-    
+
     print("Testing strategy signals...")
     print("="*60)
-    
+
     market_data = MarketData()
     strategy = StrategyFactory.create_strategy(Config.STRATEGY)
-    
+
     print(f"Strategy: {strategy.name}")
     print(f"Watchlist: {', '.join(Config.WATCHLIST)}\n")
-    
-    for symbol in Config.WATCHLIST[:5]:  # Test first 5 symbols
-        # Get data
-        data = market_data.get_historical_data(symbol, period='3mo', interval='1d')
+
+    symbols = Config.WATCHLIST[:5]  # Test first 5 symbols
+
+    # One batched download for the whole list instead of one HTTP
+    # round trip per symbol
+    frames = yf.download(
+        tickers=' '.join(symbols), period='3mo', interval='1d',
+        group_by='ticker', threads=True, progress=False
+    )
+
+    def evaluate(symbol):
+        if isinstance(frames.columns, pd.MultiIndex):
+            if symbol not in frames.columns.get_level_values(0):
+                return symbol, None, None
+            data = frames[symbol].dropna(how='all')
+        else:
+            # Single ticker comes back with flat columns
+            data = frames.dropna(how='all')
         if data.empty:
-            print(f"{symbol}: No data available")
-            continue
-        
-        # Add indicators
-        data = market_data.calculate_technical_indicators(data)
-        
-        # Generate signal
+            return symbol, None, None
+
+        # Add indicators and generate signal
+        data = market_data.calculate_technical_indicators(data.copy(), symbol)
         signal = strategy.generate_signals(symbol, data)
-        current_price = data.iloc[-1]['Close']
-        
-        print(f"{symbol}: ${current_price:.2f} - Signal: {signal}")
+        return symbol, data.iloc[-1]['Close'], signal
+
+    # Per-symbol indicator/signal work overlaps across threads
+    with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+        for symbol, current_price, signal in executor.map(evaluate, symbols):
+            if signal is None:
+                print(f"{symbol}: No data available")
+            else:
+                print(f"{symbol}: ${current_price:.2f} - Signal: {signal}")
 
 def view_database_stats():
     """Example: View trading history from database."""
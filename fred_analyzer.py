@@ -6,11 +6,22 @@ Uses FREE Federal Reserve Economic Data API
 
 import os
 import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 
+# One pooled session for the module, sized for the concurrent series
+# fetches, with retry+backoff for FRED's occasional transient errors
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2)))
+
 class FREDAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -18,7 +29,11 @@ class FREDAnalyzer:
         # FRED API key (free from https://fred.stlouisfed.org/docs/api/api_key.html)
         self.api_key = os.environ.get('FRED_API_KEY', '')
         self.base_url = "https://api.stlouisfed.org/fred/series/observations"
-        
+
+        # Shared module session: keep-alive connections for the
+        # per-series calls instead of a TLS handshake each
+        self.session = _SESSION
+
         self.cache = {}
         self.cache_duration = 86400  # 24 hours (economic data updates slowly)
         
@@ -39,29 +54,32 @@ class FREDAnalyzer:
         Returns: Bull/Bear market indicators
         """
         cache_key = "economic_regime"
-        now = datetime.now()
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_time, cached_data = self.cache[cache_key]
-            if (now - cached_time).total_seconds() < self.cache_duration:
-                return cached_data
-        
+
+        # Check cache: monotonic deadline floats - no datetime
+        # allocation on the hit path, immune to wall-clock steps
+        hit = self.cache.get(cache_key)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+
+
         try:
             if not self.api_key:
                 return self._default_regime()
             
-            # Fetch key indicators
-            fed_funds = self._get_latest_value('DFF')
-            unemployment = self._get_latest_value('UNRATE')
-            treasury_spread = self._get_latest_value('T10Y2Y')
-            vix = self._get_latest_value('VIXCLS')
-            
+            # Fetch key indicators concurrently - the four series are
+            # independent, so latency is set by the slowest response
+            # instead of the sum of all four
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                fed_funds, unemployment, treasury_spread, vix = executor.map(
+                    self._get_latest_value, ['DFF', 'UNRATE', 'T10Y2Y', 'VIXCLS'])
+
+
             # Analyze regime
             analysis = self._analyze_regime(fed_funds, unemployment, treasury_spread, vix)
             
             # Cache result
-            self.cache[cache_key] = (now, analysis)
+            self.cache[cache_key] = (time.monotonic() + self.cache_duration,
+                                     analysis)
             return analysis
             
         except Exception as e:
@@ -79,7 +97,7 @@ class FREDAnalyzer:
                 'limit': 1
             }
             
-            resp = requests.get(self.base_url, params=params, timeout=10)
+            resp = self.session.get(self.base_url, params=params, timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 observations = data.get('observations', [])
@@ -0,0 +1,225 @@
+"""
+Numba-compiled technical indicator pipeline.
+
+Computes every indicator column MarketData needs in one fused pass over
+the price arrays: each rolling window is a running sum updated in O(1)
+per bar and the EMAs carry their state through the loop, so there are no
+intermediate Series and the bars are read once. Compiles to native code
+via _njit (plain Python fallback when numba is missing - MarketData only
+selects this backend when numba is actually available).
+"""
+import numpy as np
+from _njit import njit, HAVE_NUMBA
+
+
+@njit(cache=True, fastmath=True)
+def compute_indicators(high, low, close, volume):
+    """
+    Fused single-pass indicator computation.
+
+    Args:
+        high, low, close, volume: float64 arrays of equal length
+
+    Returns:
+        (sma_20, sma_50, sma_200, ema_12, ema_26, macd, macd_signal,
+         macd_hist, rsi, bb_middle, bb_upper, bb_lower, volume_ma, atr)
+        arrays aligned to the input bars, NaN until each window fills.
+    """
+    n = close.shape[0]
+
+    sma_20 = np.full(n, np.nan)
+    sma_50 = np.full(n, np.nan)
+    sma_200 = np.full(n, np.nan)
+    ema_12 = np.empty(n)
+    ema_26 = np.empty(n)
+    macd = np.empty(n)
+    macd_signal = np.empty(n)
+    macd_hist = np.empty(n)
+    rsi = np.full(n, np.nan)
+    bb_middle = np.full(n, np.nan)
+    bb_upper = np.full(n, np.nan)
+    bb_lower = np.full(n, np.nan)
+    volume_ma = np.full(n, np.nan)
+    atr = np.full(n, np.nan)
+
+    # Running window sums (O(1) update per bar)
+    s20 = 0.0
+    s20_sq = 0.0
+    s50 = 0.0
+    s200 = 0.0
+    vol_sum = 0.0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    tr_sum = 0.0
+
+    # EMA smoothing factors (span form, adjust=False)
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    e12 = 0.0
+    e26 = 0.0
+    sig = 0.0
+
+    for i in range(n):
+        c = close[i]
+
+        # SMA 20 / Bollinger window
+        s20 += c
+        s20_sq += c * c
+        if i >= 20:
+            old = close[i - 20]
+            s20 -= old
+            s20_sq -= old * old
+        if i >= 19:
+            mean = s20 / 20.0
+            sma_20[i] = mean
+            var = (s20_sq - 20.0 * mean * mean) / 19.0
+            if var < 0.0:
+                var = 0.0
+            dev2 = 2.0 * np.sqrt(var)
+            bb_middle[i] = mean
+            bb_upper[i] = mean + dev2
+            bb_lower[i] = mean - dev2
+
+        # SMA 50 / 200
+        s50 += c
+        if i >= 50:
+            s50 -= close[i - 50]
+        if i >= 49:
+            sma_50[i] = s50 / 50.0
+        s200 += c
+        if i >= 200:
+            s200 -= close[i - 200]
+        if i >= 199:
+            sma_200[i] = s200 / 200.0
+
+        # Volume MA 20
+        vol_sum += volume[i]
+        if i >= 20:
+            vol_sum -= volume[i - 20]
+        if i >= 19:
+            volume_ma[i] = vol_sum / 20.0
+
+        # EMA / MACD state
+        if i == 0:
+            e12 = c
+            e26 = c
+        else:
+            e12 += a12 * (c - e12)
+            e26 += a26 * (c - e26)
+        ema_12[i] = e12
+        ema_26[i] = e26
+        m = e12 - e26
+        macd[i] = m
+        if i == 0:
+            sig = m
+        else:
+            sig += a9 * (m - sig)
+        macd_signal[i] = sig
+        macd_hist[i] = m - sig
+
+        # RSI: 14-bar rolling mean of gains/losses. The window ending at
+        # bar i holds deltas i-13..i; bar 0 has no delta (the pandas
+        # backend prepends a 0), so the first real eviction is delta[1]
+        # once i reaches 15
+        if i > 0:
+            d = c - close[i - 1]
+            gain_sum += d if d > 0.0 else 0.0
+            loss_sum += -d if d < 0.0 else 0.0
+        if i >= 15:
+            d_old = close[i - 14] - close[i - 15]
+            gain_sum -= d_old if d_old > 0.0 else 0.0
+            loss_sum -= -d_old if d_old < 0.0 else 0.0
+        if i >= 13:
+            if loss_sum > 0.0:
+                rs = gain_sum / loss_sum
+                rsi[i] = 100.0 - 100.0 / (1.0 + rs)
+            else:
+                rsi[i] = 100.0
+
+        # ATR: 14-bar rolling mean of the true range
+        if i == 0:
+            tr = high[0] - low[0]
+        else:
+            pc = close[i - 1]
+            tr = high[i] - low[i]
+            hc = abs(high[i] - pc)
+            if hc > tr:
+                tr = hc
+            lc = abs(low[i] - pc)
+            if lc > tr:
+                tr = lc
+        tr_sum += tr
+        if i >= 14:
+            j = i - 14
+            if j == 0:
+                tr_old = high[0] - low[0]
+            else:
+                pc = close[j - 1]
+                tr_old = high[j] - low[j]
+                hc = abs(high[j] - pc)
+                if hc > tr_old:
+                    tr_old = hc
+                lc = abs(low[j] - pc)
+                if lc > tr_old:
+                    tr_old = lc
+            tr_sum -= tr_old
+        if i >= 13:
+            atr[i] = tr_sum / 14.0
+
+    return (sma_20, sma_50, sma_200, ema_12, ema_26, macd, macd_signal,
+            macd_hist, rsi, bb_middle, bb_upper, bb_lower, volume_ma, atr)
+
+
+@njit(cache=True)
+def macd_fused(close):
+    """
+    EMA_12/EMA_26/MACD/Signal/Hist in one state-carrying loop.
+
+    Standalone version of the MACD chain inside compute_indicators, for
+    callers that only need the MACD family: one pass over the bars
+    instead of four ewm traversals plus their intermediate arrays.
+    """
+    n = close.shape[0]
+    ema_12 = np.empty(n)
+    ema_26 = np.empty(n)
+    macd = np.empty(n)
+    macd_signal = np.empty(n)
+    macd_hist = np.empty(n)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    e12 = 0.0
+    e26 = 0.0
+    sig = 0.0
+
+    for i in range(n):
+        c = close[i]
+        if i == 0:
+            e12 = c
+            e26 = c
+        else:
+            e12 += a12 * (c - e12)
+            e26 += a26 * (c - e26)
+        ema_12[i] = e12
+        ema_26[i] = e26
+        m = e12 - e26
+        macd[i] = m
+        if i == 0:
+            sig = m
+        else:
+            sig += a9 * (m - sig)
+        macd_signal[i] = sig
+        macd_hist[i] = m - sig
+
+    return ema_12, ema_26, macd, macd_signal, macd_hist
+
+
+if HAVE_NUMBA:
+    # Trigger compilation at import so the first real call doesn't pay
+    # the JIT latency (cache=True makes this cheap on later runs)
+    _z = np.zeros(1)
+    compute_indicators(_z, _z, _z, _z)
+    macd_fused(_z)
+    del _z
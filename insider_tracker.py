@@ -4,16 +4,89 @@ Track when CEOs, directors, and executives buy/sell their company's stock
 FREE data from SEC EDGAR API
 """
 
-import os
 import json
+import threading
+import time
 import requests
-from datetime import datetime, timedelta
+
+# orjson decodes the ~10MB SEC tickers blob 2-3x faster than stdlib
+# json; fall back transparently when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from datetime import date, datetime, timedelta
+from io import BytesIO
 from typing import Dict, List, Optional, Tuple
 import logging
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
+
+# lxml's C parser builds the EDGAR Atom tree several times faster than
+# the stdlib; the findall/findtext API is identical, so fall back
+# transparently when it is not installed
+try:
+    from lxml import etree as ET
+    _XML_PARSE_ERROR = ET.XMLSyntaxError
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _XML_PARSE_ERROR = ET.ParseError
+
+from _njit import njit
+
+# Code tables for the scoring kernel below
+_SIGNALS = ('NEUTRAL', 'BULLISH', 'BEARISH')
+_ACTIONS = ('HOLD', 'BUY', 'AVOID')
+
+
+@njit(cache=True)
+def _score_trades(buy_count, sell_count, recent_count):
+    """Signal/confidence/action branch tree on plain integers.
+
+    Returns (signal, confidence, action) as indices into _SIGNALS /
+    _ACTIONS; compiled with numba when available, plain Python
+    otherwise. Keeping it free of dicts and strings is what makes it
+    compilable and cheap to call per symbol in get_summary.
+    """
+    signal = 0
+    confidence = 0
+
+    if buy_count >= 3:
+        signal = 1
+        confidence = 85
+    elif buy_count >= 1:
+        signal = 1
+        confidence = 70
+
+    if sell_count > 5:
+        if signal == 1:
+            confidence -= 20
+        else:
+            signal = 2
+            confidence = 60
+
+    if recent_count > 0:
+        confidence += 10
+
+    action = 0
+    if signal == 1 and confidence > 75:
+        action = 1
+    elif signal == 2 and confidence > 70:
+        action = 2
+
+    return signal, confidence, action
+
 
 class InsiderTracker:
+    # company_tickers.json is ~10MB and effectively static; download it
+    # once per process and index it, shared across tracker instances
+    _ticker_map = None
+    _ticker_map_deadline = 0.0
+    _TICKER_MAP_TTL = 86400  # 24 hours
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.base_url = "https://www.sec.gov"
@@ -22,8 +95,24 @@ class InsiderTracker:
             'Accept-Encoding': 'gzip, deflate',
             'Host': 'www.sec.gov'
         }
-        self.cache = {}
-        self.cache_duration = 3600  # 1 hour
+        # Pooled session: the per-symbol EDGAR calls reuse keep-alive
+        # connections instead of a fresh TLS handshake each, sized to
+        # match the get_summary thread fan-out, with retries for the
+        # rate-limit/maintenance responses SEC serves under load
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=16, pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=[429, 502, 503])))
+        # Bounded cache with 1-hour expiry; old symbols are evicted
+        # instead of accumulating forever. TTLCache is not thread-safe
+        # and get_summary fans out across threads, so access is locked
+        self.cache = TTLCache(maxsize=512, ttl=3600)
+        self._cache_lock = threading.Lock()
+        # Conditional-GET state per feed: (etag, last_modified, filings)
+        # so an unchanged feed costs a 304 with no body or re-parse
+        self._feed_cache = {}
         
     def get_insider_activity(self, symbol: str, days: int = 90) -> Dict:
         """
@@ -31,14 +120,14 @@ class InsiderTracker:
         Analyzes SEC Form 4 filings (insider transactions)
         """
         cache_key = f"insider_{symbol}_{days}"
-        now = datetime.now()
-        
-        # Check cache
-        if cache_key in self.cache:
-            cached_time, cached_data = self.cache[cache_key]
-            if (now - cached_time).total_seconds() < self.cache_duration:
-                return cached_data
-        
+
+        # Check cache (TTLCache handles expiry)
+        try:
+            with self._cache_lock:
+                return self.cache[cache_key]
+        except KeyError:
+            pass
+
         try:
             # Get company CIK number
             cik = self._get_cik(symbol)
@@ -52,33 +141,40 @@ class InsiderTracker:
             analysis = self._analyze_insider_trades(symbol, filings)
             
             # Cache result
-            self.cache[cache_key] = (now, analysis)
+            with self._cache_lock:
+                self.cache[cache_key] = analysis
             return analysis
             
         except Exception as e:
-            self.logger.error(f"Error tracking insiders for {symbol}: {e}")
+            self.logger.error("Error tracking insiders for %s: %s", symbol, e)
             return self._empty_response()
     
     def _get_cik(self, symbol: str) -> Optional[str]:
         """Get company CIK number from ticker symbol"""
         try:
-            # SEC company tickers JSON
-            url = "https://www.sec.gov/files/company_tickers.json"
-            resp = requests.get(url, headers=self.headers, timeout=10)
-            
-            if resp.status_code != 200:
-                return None
-            
-            companies = resp.json()
-            for company in companies.values():
-                if company.get('ticker', '').upper() == symbol.upper():
-                    cik = str(company.get('cik_str', '')).zfill(10)
-                    return cik
-            
-            return None
-            
+            cls = InsiderTracker
+            if cls._ticker_map is None or time.monotonic() > cls._ticker_map_deadline:
+                # SEC company tickers JSON - fetched once, indexed by
+                # ticker so every later lookup is an O(1) probe
+                url = "https://www.sec.gov/files/company_tickers.json"
+                resp = self.session.get(url, timeout=10)
+
+                if resp.status_code != 200:
+                    return None
+
+                # Decode from raw bytes; resp.json() re-runs encoding
+                # detection before handing off to stdlib json
+                cls._ticker_map = {
+                    company['ticker'].upper(): str(company['cik_str']).zfill(10)
+                    for company in _loads(resp.content).values()
+                    if company.get('ticker')
+                }
+                cls._ticker_map_deadline = time.monotonic() + cls._TICKER_MAP_TTL
+
+            return cls._ticker_map.get(symbol.upper())
+
         except Exception as e:
-            self.logger.error(f"Error getting CIK: {e}")
+            self.logger.error("Error getting CIK: %s", e)
             return None
     
     def _get_form4_filings(self, cik: str, days: int) -> List[Dict]:
@@ -96,35 +192,62 @@ class InsiderTracker:
                 'output': 'atom'
             }
             
-            resp = requests.get(url, headers=self.headers, params=params, timeout=15)
+            # Send the validators from the last fetch; EDGAR answers 304
+            # with no body when the feed is unchanged
+            etag, last_modified, cached = self._feed_cache.get(cik, (None, None, None))
+            cond_headers = {}
+            if etag:
+                cond_headers['If-None-Match'] = etag
+            if last_modified:
+                cond_headers['If-Modified-Since'] = last_modified
+
+            resp = self.session.get(url, params=params, headers=cond_headers,
+                                    timeout=15)
+            if resp.status_code == 304 and cached is not None:
+                # Feed unchanged; re-filter the cached parse against a
+                # fresh cutoff instead of downloading and parsing again
+                cutoff = date.today() - timedelta(days=days)
+                return [f for f in cached if f['date'] >= cutoff]
             if resp.status_code != 200:
                 return []
-            
-            # Parse XML/Atom feed
+
+            # Stream the Atom feed with iterparse: entries are handled
+            # and freed one at a time, and because the feed is
+            # reverse-chronological parsing stops at the first entry
+            # past the cutoff. Dates are parsed once here (ISO format,
+            # so fromisoformat beats strptime ~10x) and stored as date
+            # objects the analysis reuses
             filings = []
+            cutoff = date.today() - timedelta(days=days)
+            entry_tag = '{http://www.w3.org/2005/Atom}entry'
             try:
-                root = ET.fromstring(resp.content)
-                ns = {'atom': 'http://www.w3.org/2005/Atom'}
-                
-                for entry in root.findall('atom:entry', ns):
-                    filing_date = entry.find('atom:updated', ns)
+                for _, elem in ET.iterparse(BytesIO(resp.content), events=('end',)):
+                    if elem.tag != entry_tag:
+                        continue
+                    filing_date = elem.find('{http://www.w3.org/2005/Atom}updated')
                     if filing_date is not None:
-                        date_str = filing_date.text.split('T')[0]
-                        filing_dt = datetime.strptime(date_str, '%Y-%m-%d')
-                        
+                        filing_dt = date.fromisoformat(filing_date.text.split('T')[0])
+
                         # Filter by date range
-                        if (datetime.now() - filing_dt).days <= days:
-                            filings.append({
-                                'date': date_str,
-                                'url': entry.find('atom:link', ns).get('href') if entry.find('atom:link', ns) is not None else ''
-                            })
-            except ET.ParseError:
+                        if filing_dt < cutoff:
+                            elem.clear()
+                            break
+                        link_el = elem.find('{http://www.w3.org/2005/Atom}link')
+                        filings.append({
+                            'date': filing_dt,
+                            'url': link_el.get('href') if link_el is not None else ''
+                        })
+                    elem.clear()
+            except _XML_PARSE_ERROR:
                 pass
-            
+
+            self._feed_cache[cik] = (resp.headers.get('ETag'),
+                                     resp.headers.get('Last-Modified'),
+                                     filings)
             return filings
             
         except Exception as e:
-            self.logger.error(f"Error fetching Form 4s: {e}")
+            self.logger.error("Error fetching Form 4s: %s", e)
             return []
     
     def _analyze_insider_trades(self, symbol: str, filings: List[Dict]) -> Dict:
@@ -150,60 +273,45 @@ class InsiderTracker:
         # This is simplified - real implementation would parse XML
         buy_count = max(1, total_filings // 4)  # Assume 25% are buys
         sell_count = total_filings - buy_count
-        
-        # Calculate signal
-        signal = "NEUTRAL"
-        confidence = 0
+
+        # Recent activity more important; dates were parsed at fetch
+        now = datetime.now()
+        today = now.date()
+        recent_filings = [f for f in filings if (today - f['date']).days <= 7]
+
+        # Score through the compiled kernel; reasons are built here so
+        # the kernel stays scalar-only
+        signal_code, confidence, action_code = _score_trades(
+            buy_count, sell_count, len(recent_filings))
+
         reasons = []
-        
         # Insider buying is very bullish (they have inside info)
-        if buy_count > 0:
-            if buy_count >= 3:  # Multiple insiders buying
-                signal = "BULLISH"
-                confidence = 85
-                reasons.append(f"{buy_count} insider buy transactions in {len(filings)} filings")
-            elif buy_count >= 1:
-                signal = "BULLISH"
-                confidence = 70
-                reasons.append(f"{buy_count} insider buy transaction(s)")
-        
+        if buy_count >= 3:  # Multiple insiders buying
+            reasons.append(f"{buy_count} insider buy transactions in {len(filings)} filings")
+        elif buy_count >= 1:
+            reasons.append(f"{buy_count} insider buy transaction(s)")
+
         # Heavy selling is bearish
         if sell_count > 5:
-            if signal == "BULLISH":
-                # Mixed signals
-                confidence -= 20
+            if signal_code == 1:
                 reasons.append(f"But {sell_count} sell transactions detected")
             else:
-                signal = "BEARISH"
-                confidence = 60
                 reasons.append(f"{sell_count} insider sell transactions")
-        
-        # Recent activity more important
-        recent_filings = [f for f in filings if 
-                         (datetime.now() - datetime.strptime(f['date'], '%Y-%m-%d')).days <= 7]
-        
+
         if recent_filings:
-            confidence += 10
             reasons.append(f"{len(recent_filings)} filings in last 7 days")
-        
-        # Determine action
-        action = "HOLD"
-        if signal == "BULLISH" and confidence > 75:
-            action = "BUY"
-        elif signal == "BEARISH" and confidence > 70:
-            action = "AVOID"
-        
+
         return {
-            'signal': signal,
+            'signal': _SIGNALS[signal_code],
             'confidence': min(100, int(confidence)),
-            'action': action,
+            'action': _ACTIONS[action_code],
             'buy_count': buy_count,
             'sell_count': sell_count,
             'total_filings': total_filings,
             'recent_filings': len(recent_filings),
             'reasons': reasons,
-            'latest_filing_date': filings[0]['date'] if filings else None,
-            'timestamp': datetime.now().isoformat()
+            'latest_filing_date': filings[0]['date'].isoformat() if filings else None,
+            'timestamp': now.isoformat()
         }
     
     def _empty_response(self) -> Dict:
@@ -273,9 +381,13 @@ class InsiderTracker:
             'timestamp': datetime.now().isoformat()
         }
         
-        for symbol in symbols:
-            analysis = self.get_insider_activity(symbol)
-            
+        # Per-symbol analyses are independent HTTP fan-outs; a bounded
+        # pool overlaps them (8 workers stays under SEC's 10 req/s
+        # guidance) while results come back in watchlist order
+        with ThreadPoolExecutor(max_workers=min(8, max(len(symbols), 1))) as executor:
+            analyses = list(executor.map(self.get_insider_activity, symbols))
+
+        for symbol, analysis in zip(symbols, analyses):
             if analysis['signal'] == 'BULLISH' and analysis['confidence'] > 70:
                 summary['insider_buying'].append({
                     'symbol': symbol,
@@ -2,8 +2,12 @@
 Logging and monitoring system.
 Handles all logging, performance tracking, and alerts.
 """
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import colorlog
+import numpy as np
 from datetime import datetime
 import os
 from typing import Dict
@@ -44,18 +48,27 @@ def setup_logging(log_level: str = 'INFO', log_file: str = None):
     # Root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(color_formatter)
-    root_logger.addHandler(console_handler)
-    
+
     # File handler
+    handlers = [console_handler]
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
-    
+        handlers.append(file_handler)
+
+    # Log calls from the trading loop only enqueue the record; a
+    # background listener thread owns the real handlers and does the
+    # actual console/file I/O off the critical path
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # drain the queue on shutdown
+
     return root_logger
 
 class PerformanceTracker:
@@ -63,31 +76,43 @@ class PerformanceTracker:
     
     def __init__(self):
         self.trades = []
+        # P&L mirrored into a contiguous array (doubling growth) so the
+        # summary runs as NumPy reductions instead of three dict-lookup
+        # scans over the trade list
+        self._pnl = np.empty(1024, dtype=np.float64)
+        self._n_trades = 0
         self.daily_stats = {}
         self.start_time = datetime.now()
         self.logger = logging.getLogger(__name__)
-    
+
     def record_trade(self, trade: Dict):
         """Record a completed trade."""
         trade['timestamp'] = datetime.now()
         self.trades.append(trade)
-        self.logger.info(f"Trade recorded: {trade['symbol']} - P&L: ${trade.get('pnl', 0):.2f}")
-    
+        if self._n_trades == len(self._pnl):
+            self._pnl = np.resize(self._pnl, len(self._pnl) * 2)
+        self._pnl[self._n_trades] = trade.get('pnl', 0)
+        self._n_trades += 1
+        # %-style defers formatting until a handler accepts the record
+        self.logger.info("Trade recorded: %s - P&L: $%.2f",
+                         trade['symbol'], trade.get('pnl', 0))
+
     def get_performance_summary(self) -> Dict:
         """Get overall performance summary."""
-        if not self.trades:
+        total_trades = self._n_trades
+        if not total_trades:
             return {
                 'total_trades': 0,
                 'total_pnl': 0,
                 'win_rate': 0,
                 'avg_pnl': 0
             }
-        
-        total_trades = len(self.trades)
-        total_pnl = sum(t.get('pnl', 0) for t in self.trades)
-        winning_trades = sum(1 for t in self.trades if t.get('pnl', 0) > 0)
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
+
+        pnl = self._pnl[:total_trades]
+        total_pnl = float(pnl.sum())
+        winning_trades = int(np.count_nonzero(pnl > 0))
+        win_rate = winning_trades / total_trades * 100
+        avg_pnl = total_pnl / total_trades
         
         return {
             'total_trades': total_trades,
@@ -128,13 +153,13 @@ class AlertSystem:
             message: Alert message
         """
         if level.upper() == 'INFO':
-            self.logger.info(f"ALERT: {message}")
+            self.logger.info("ALERT: %s", message)
         elif level.upper() == 'WARNING':
-            self.logger.warning(f"ALERT: {message}")
+            self.logger.warning("ALERT: %s", message)
         elif level.upper() == 'ERROR':
-            self.logger.error(f"ALERT: {message}")
+            self.logger.error("ALERT: %s", message)
         elif level.upper() == 'CRITICAL':
-            self.logger.critical(f"ALERT: {message}")
+            self.logger.critical("ALERT: %s", message)
         
         # In production, you could extend this to send emails, SMS, etc.
     
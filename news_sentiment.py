@@ -3,14 +3,70 @@ News and Sentiment Analysis Module
 Analyzes market news and sentiment to inform trading decisions
 """
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List
+from cachetools import TTLCache
 from alpaca.data.historical import NewsClient
 from alpaca.data.requests import NewsRequest
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Keyword tables for the headline scorer, built once at import instead
+# of per headline
+_POSITIVE_WORDS = (
+    'surge', 'soar', 'jump', 'rally', 'gain', 'profit', 'beat', 'exceed',
+    'record', 'high', 'growth', 'upgrade', 'buy', 'bullish', 'strong',
+    'rise', 'boost', 'advance', 'outperform', 'success', 'positive',
+    'breakthrough', 'innovation', 'expansion', 'partnership', 'deal',
+    'acquisition', 'revenue', 'earnings beat'
+)
+_NEGATIVE_WORDS = (
+    'plunge', 'crash', 'fall', 'drop', 'decline', 'loss', 'miss', 'weak',
+    'concern', 'worry', 'risk', 'downgrade', 'sell', 'bearish', 'poor',
+    'lawsuit', 'investigation', 'scandal', 'layoff', 'cut', 'bankruptcy',
+    'debt', 'warning', 'volatile', 'uncertain', 'fear', 'crisis',
+    'delay', 'postpone', 'cancel', 'disappoint'
+)
+_VERY_POSITIVE = ('record profit', 'blowout earnings', 'major breakthrough')
+_VERY_NEGATIVE = ('bankruptcy', 'fraud', 'recall', 'criminal')
+
+# Fallback-path tables: single words match whole tokens via set
+# intersection (so 'buy' no longer matches 'buyback'); multi-word
+# phrases keep substring scans since they span token boundaries
+_HEADLINE_RE = re.compile(r"[a-z']+")
+_POSITIVE_SET = frozenset(w for w in _POSITIVE_WORDS if ' ' not in w)
+_POSITIVE_PHRASES = tuple(w for w in _POSITIVE_WORDS if ' ' in w)
+_NEGATIVE_SET = frozenset(_NEGATIVE_WORDS)
+_VERY_NEGATIVE_SET = frozenset(_VERY_NEGATIVE)
+
+# Aho-Corasick automaton matches every keyword in one pass over the
+# headline; payload carries (keyword, summed weight) so terms in two
+# lists (e.g. 'bankruptcy') score exactly as the substring scan did
+try:
+    import ahocorasick
+
+    _AUTOMATON = ahocorasick.Automaton()
+    _weights = {}
+    for _w in _POSITIVE_WORDS:
+        _weights[_w] = _weights.get(_w, 0.0) + 0.15
+    for _w in _NEGATIVE_WORDS:
+        _weights[_w] = _weights.get(_w, 0.0) - 0.15
+    for _w in _VERY_POSITIVE:
+        _weights[_w] = _weights.get(_w, 0.0) + 0.5
+    for _w in _VERY_NEGATIVE:
+        _weights[_w] = _weights.get(_w, 0.0) - 0.5
+    for _w, _wt in _weights.items():
+        _AUTOMATON.add_word(_w, (_w, _wt))
+    _AUTOMATON.make_automaton()
+    del _weights
+except ImportError:
+    _AUTOMATON = None
+
+
 class NewsSentimentAnalyzer:
     """Analyzes news sentiment for stocks."""
     
@@ -21,11 +77,17 @@ class NewsSentimentAnalyzer:
                 api_key=Config.ALPACA_API_KEY,
                 secret_key=Config.ALPACA_SECRET_KEY
             )
-            self.sentiment_cache = {}  # Cache recent sentiment
+            # Bounded cache with 30-minute expiry; evicts on its own
+            # instead of growing for the life of the process. TTLCache
+            # is not thread-safe and get_news_summary fans out across
+            # threads, so access is locked
+            self.sentiment_cache = TTLCache(maxsize=2048, ttl=1800)
+            self._cache_lock = threading.Lock()
             logger.info("News sentiment analyzer initialized")
         except Exception as e:
-            logger.error(f"Failed to initialize news client: {e}")
+            logger.error("Failed to initialize news client: %s", e)
             self.news_client = None
+        self._finbert = None  # lazy; model load deferred to first use
     
     def get_news_sentiment(self, symbol: str, hours: int = 24) -> Dict:
         """
@@ -38,13 +100,14 @@ class NewsSentimentAnalyzer:
             return self._get_default_sentiment()
         
         try:
-            # Check cache first (valid for 30 minutes)
+            # Check cache first (TTLCache expires entries after 30 min)
             cache_key = f"{symbol}_{hours}"
-            if cache_key in self.sentiment_cache:
-                cached = self.sentiment_cache[cache_key]
-                if (datetime.now() - cached['timestamp']).seconds < 1800:
-                    return cached['data']
-            
+            try:
+                with self._cache_lock:
+                    return self.sentiment_cache[cache_key]
+            except KeyError:
+                pass
+
             # Fetch news from Alpaca
             start_time = datetime.now() - timedelta(hours=hours)
             
@@ -59,28 +122,13 @@ class NewsSentimentAnalyzer:
             if not news or len(news.data) == 0:
                 return self._get_default_sentiment()
             
-            # Analyze sentiment from news articles
-            sentiment_scores = []
-            positive_count = 0
-            negative_count = 0
-            neutral_count = 0
-            headlines = []
-            
-            for article in news.data:
-                # Alpaca provides sentiment in the article metadata
-                headline = article.headline
-                headlines.append(headline)
-                
-                # Simple sentiment analysis based on keywords
-                sentiment = self._analyze_headline_sentiment(headline)
-                sentiment_scores.append(sentiment)
-                
-                if sentiment > 0.1:
-                    positive_count += 1
-                elif sentiment < -0.1:
-                    negative_count += 1
-                else:
-                    neutral_count += 1
+            # Score all headlines in one batched call
+            headlines = [article.headline for article in news.data]
+            sentiment_scores = self._score_headlines(headlines)
+
+            positive_count = sum(1 for s in sentiment_scores if s > 0.1)
+            negative_count = sum(1 for s in sentiment_scores if s < -0.1)
+            neutral_count = len(sentiment_scores) - positive_count - negative_count
             
             # Calculate overall sentiment
             avg_sentiment = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
@@ -112,66 +160,85 @@ class NewsSentimentAnalyzer:
             }
             
             # Cache the result
-            self.sentiment_cache[cache_key] = {
-                'data': result,
-                'timestamp': datetime.now()
-            }
-            
+            with self._cache_lock:
+                self.sentiment_cache[cache_key] = result
+
             return result
             
         except Exception as e:
-            logger.error(f"Error fetching news sentiment for {symbol}: {e}")
+            logger.error("Error fetching news sentiment for %s: %s", symbol, e)
             return self._get_default_sentiment()
     
+    def _get_finbert(self):
+        """Lazily build the FinBERT pipeline; None when unavailable."""
+        if self._finbert is None:
+            try:
+                from transformers import pipeline
+                self._finbert = pipeline(
+                    'sentiment-analysis', model='ProsusAI/finbert',
+                    truncation=True
+                )
+                logger.info("FinBERT sentiment pipeline loaded")
+            except Exception as e:
+                logger.info("FinBERT unavailable, using keyword scorer: %s", e)
+                self._finbert = False
+        return self._finbert or None
+
+    def _score_headlines(self, headlines: List[str]) -> List[float]:
+        """
+        Score a batch of headlines from -1 (negative) to +1 (positive).
+
+        When transformers is installed all headlines go through FinBERT
+        in one batched forward pass; otherwise each headline falls back
+        to the keyword scorer.
+        """
+        if not headlines:
+            return []
+
+        clf = self._get_finbert()
+        if clf is not None:
+            try:
+                results = clf(headlines, batch_size=32)
+                signs = {'positive': 1.0, 'negative': -1.0}
+                return [signs.get(r['label'].lower(), 0.0) * r['score']
+                        for r in results]
+            except Exception as e:
+                logger.error("FinBERT scoring failed: %s", e)
+
+        return [self._analyze_headline_sentiment(h) for h in headlines]
+
     def _analyze_headline_sentiment(self, headline: str) -> float:
         """
         Analyze sentiment of a headline using keyword matching.
         Returns score from -1 (very negative) to +1 (very positive)
         """
         headline_lower = headline.lower()
-        
-        # Positive keywords
-        positive_words = [
-            'surge', 'soar', 'jump', 'rally', 'gain', 'profit', 'beat', 'exceed',
-            'record', 'high', 'growth', 'upgrade', 'buy', 'bullish', 'strong',
-            'rise', 'boost', 'advance', 'outperform', 'success', 'positive',
-            'breakthrough', 'innovation', 'expansion', 'partnership', 'deal',
-            'acquisition', 'revenue', 'earnings beat'
-        ]
-        
-        # Negative keywords
-        negative_words = [
-            'plunge', 'crash', 'fall', 'drop', 'decline', 'loss', 'miss', 'weak',
-            'concern', 'worry', 'risk', 'downgrade', 'sell', 'bearish', 'poor',
-            'lawsuit', 'investigation', 'scandal', 'layoff', 'cut', 'bankruptcy',
-            'debt', 'warning', 'volatile', 'uncertain', 'fear', 'crisis',
-            'delay', 'postpone', 'cancel', 'disappoint'
-        ]
-        
-        # Very strong positive
-        very_positive = ['record profit', 'blowout earnings', 'major breakthrough']
-        
-        # Very strong negative
-        very_negative = ['bankruptcy', 'fraud', 'recall', 'criminal']
-        
         score = 0.0
-        
-        # Check very strong signals first
-        for phrase in very_positive:
-            if phrase in headline_lower:
-                score += 0.5
-        
-        for phrase in very_negative:
-            if phrase in headline_lower:
-                score -= 0.5
-        
-        # Count positive and negative words
-        positive_count = sum(1 for word in positive_words if word in headline_lower)
-        negative_count = sum(1 for word in negative_words if word in headline_lower)
-        
-        # Calculate sentiment score
-        score += (positive_count * 0.15) - (negative_count * 0.15)
-        
+
+        if _AUTOMATON is not None:
+            # Single scan matches all keywords at once; score each
+            # distinct keyword once, like the substring membership tests
+            seen = set()
+            for _, (word, weight) in _AUTOMATON.iter(headline_lower):
+                if word not in seen:
+                    seen.add(word)
+                    score += weight
+        else:
+            # Fallback: tokenize once, then C-level set intersections
+            # for single words; phrases still need substring scans
+            tokens = set(_HEADLINE_RE.findall(headline_lower))
+
+            for phrase in _VERY_POSITIVE:
+                if phrase in headline_lower:
+                    score += 0.5
+            score -= 0.5 * len(_VERY_NEGATIVE_SET & tokens)
+
+            for phrase in _POSITIVE_PHRASES:
+                if phrase in headline_lower:
+                    score += 0.15
+            score += 0.15 * len(_POSITIVE_SET & tokens)
+            score -= 0.15 * len(_NEGATIVE_SET & tokens)
+
         # Clamp to -1 to +1 range
         return max(-1.0, min(1.0, score))
     
@@ -241,9 +308,12 @@ class NewsSentimentAnalyzer:
             'top_stories': []
         }
         
-        for symbol in symbols:
-            sentiment = self.get_news_sentiment(symbol, hours=24)
-            
+        # Fetch each symbol's news concurrently - pure I/O fan-out, so
+        # total latency tracks the slowest response, not the sum
+        with ThreadPoolExecutor(max_workers=min(8, max(len(symbols), 1))) as executor:
+            sentiments = list(executor.map(self.get_news_sentiment, symbols))
+
+        for symbol, sentiment in zip(symbols, sentiments):
             if sentiment['sentiment_label'] == 'BULLISH' and sentiment['confidence'] > 60:
                 summary['bullish_symbols'].append({
                     'symbol': symbol,
@@ -6,19 +6,91 @@ Uses free Tradier API data
 
 import os
 import json
+import threading
+from collections import defaultdict, namedtuple
+import numpy as np
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+# diskcache persists analyses across restarts and shares them between
+# worker processes; without it the cache stays in-process
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# orjson decodes the multi-hundred-strike chain payloads ~3x faster
+# than stdlib json; fall back transparently when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Template for the no-data response; copied per call with a fresh
+# timestamp instead of rebuilding the literal every time
+_EMPTY_RESPONSE = {
+    'signal': 'NEUTRAL',
+    'confidence': 0,
+    'action': 'HOLD',
+    'put_call_ratio': 0,
+    'call_volume': 0,
+    'put_volume': 0,
+    'total_volume': 0,
+    'reasons': ['No options data available'],
+    'whale_trades': [],
+}
+
+# Slot-based record for whale trades; cheaper to build than a dict and
+# only rendered to one at the API boundary
+WhaleTrade = namedtuple('WhaleTrade', 'type strike volume premium')
+
+# Position-boost tiers: (confidence threshold, bullish multiplier,
+# bearish multiplier), checked highest first. New tiers are one row.
+_BOOST_TIERS = ((80, 1.5, 0.5), (70, 1.3, 0.7), (-1, 1.1, 0.9))
+
+
 class OptionsFlowAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         # Tradier sandbox API (free tier)
         self.api_key = os.environ.get('TRADIER_API_KEY', 'sandbox')
         self.base_url = "https://sandbox.tradier.com/v1"
+        # Endpoint URLs built once instead of re-interpolated per call
+        self._exp_url = f"{self.base_url}/markets/options/expirations"
+        self._chain_url = f"{self.base_url}/markets/options/chains"
+        self._quotes_url = f"{self.base_url}/markets/quotes"
+        # Pooled session with keep-alive: each symbol costs two Tradier
+        # calls (expirations + chain), and connection reuse saves the
+        # TLS handshake on every one after the first
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.api_key}',
+            'Accept': 'application/json'
+        })
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=32, pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2)))
         self.cache = {}
         self.cache_duration = 1800  # 30 minutes
+        self._cache_lock = threading.Lock()  # get_summary runs threaded
+        # One lock per symbol so concurrent misses on the same symbol
+        # collapse to a single API fetch instead of a stampede
+        self._symbol_locks = defaultdict(threading.Lock)
+        self._expirations_cache = {}  # symbol -> (date, expirations)
+        self._disk_cache = None
+        if diskcache is not None:
+            try:
+                self._disk_cache = diskcache.Cache(
+                    os.path.join('data_cache', 'options_flow'),
+                    size_limit=128 << 20)
+            except Exception as e:
+                self.logger.warning(f"Disk cache unavailable: {e}")
         
     def get_unusual_options_activity(self, symbol: str) -> Dict:
         """
@@ -26,65 +98,117 @@ class OptionsFlowAnalyzer:
         Returns signals based on large option trades
         """
         cache_key = f"options_{symbol}"
-        now = datetime.now()
-        
+
         # Check cache
-        if cache_key in self.cache:
-            cached_time, cached_data = self.cache[cache_key]
-            if (now - cached_time).total_seconds() < self.cache_duration:
-                return cached_data
-        
-        try:
-            # Get options chain
-            chain_data = self._get_options_chain(symbol)
-            if not chain_data:
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Only the first thread to miss fetches; the rest wait here and
+        # pick up the freshly cached result
+        with self._symbol_locks[symbol]:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            try:
+                # Get options chain
+                chain_data = self._get_options_chain(symbol)
+                if not chain_data:
+                    return self._empty_response()
+
+                # Analyze unusual activity
+                analysis = self._analyze_options_flow(symbol, chain_data)
+
+                # Cache result
+                self._cache_set(cache_key, analysis)
+                return analysis
+
+            except Exception as e:
+                self.logger.error(f"Error analyzing options for {symbol}: {e}")
                 return self._empty_response()
-            
-            # Analyze unusual activity
-            analysis = self._analyze_options_flow(symbol, chain_data)
-            
-            # Cache result
-            self.cache[cache_key] = (now, analysis)
-            return analysis
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing options for {symbol}: {e}")
-            return self._empty_response()
     
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        """Look up a cached analysis; expiry is handled per backend."""
+        with self._cache_lock:
+            if self._disk_cache is not None:
+                return self._disk_cache.get(key)
+            entry = self.cache.get(key)
+            if entry is not None:
+                cached_time, cached_data = entry
+                if (datetime.now() - cached_time).total_seconds() < self.cache_duration:
+                    return cached_data
+            return None
+
+    def _cache_set(self, key: str, analysis: Dict):
+        """Store an analysis with the configured TTL."""
+        with self._cache_lock:
+            if self._disk_cache is not None:
+                self._disk_cache.set(key, analysis, expire=self.cache_duration)
+            else:
+                self.cache[key] = (datetime.now(), analysis)
+
     def _get_options_chain(self, symbol: str) -> Optional[Dict]:
         """Fetch options chain from Tradier API"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Accept': 'application/json'
-            }
-            
-            # Get expiration dates
-            exp_url = f"{self.base_url}/markets/options/expirations"
-            params = {'symbol': symbol}
-            resp = requests.get(exp_url, headers=headers, params=params, timeout=10)
-            
-            if resp.status_code != 200:
-                return None
-            
-            expirations = resp.json().get('expirations', {}).get('date', [])
+            # Expiration dates only change daily; cache them per symbol
+            # so repeat fetches cost one HTTP call instead of two
+            today = datetime.now().date()
+            cached_exp = self._expirations_cache.get(symbol)
+            if cached_exp is not None and cached_exp[0] == today:
+                expirations = cached_exp[1]
+            else:
+                resp = self.session.get(self._exp_url,
+                                        params={'symbol': symbol}, timeout=10)
+
+                if resp.status_code != 200:
+                    return None
+
+                expirations = _loads(resp.content).get('expirations', {}).get('date', [])
+                self._expirations_cache[symbol] = (today, expirations)
             if not expirations:
                 return None
-            
+
             # Get nearest expiration chain
             nearest_exp = expirations[0]
-            chain_url = f"{self.base_url}/markets/options/chains"
-            params = {'symbol': symbol, 'expiration': nearest_exp}
-            resp = requests.get(chain_url, headers=headers, params=params, timeout=10)
-            
+            resp = self.session.get(
+                self._chain_url,
+                params={'symbol': symbol, 'expiration': nearest_exp},
+                timeout=10)
+
             if resp.status_code == 200:
-                return resp.json()
+                return _loads(resp.content)
             return None
             
         except Exception as e:
             self.logger.error(f"Error fetching options chain: {e}")
             return None
     
+    def _filter_active_symbols(self, symbols: List[str]) -> List[str]:
+        """Drop symbols Tradier has no quote for via one batched call.
+
+        One quotes request covers the whole list, so unknown or
+        delisted symbols never cost their two chain round trips.
+        """
+        if len(symbols) <= 1:
+            return list(symbols)
+        try:
+            resp = self.session.get(self._quotes_url,
+                                    params={'symbols': ','.join(symbols)},
+                                    timeout=10)
+            if resp.status_code != 200:
+                return list(symbols)
+
+            quotes = _loads(resp.content).get('quotes', {}).get('quote', [])
+            if isinstance(quotes, dict):  # single match comes back bare
+                quotes = [quotes]
+            known = {q.get('symbol') for q in quotes}
+            return [s for s in symbols if s in known]
+
+        except Exception as e:
+            self.logger.error(f"Error batch-quoting symbols: {e}")
+            return list(symbols)
+
     def _analyze_options_flow(self, symbol: str, chain_data: Dict) -> Dict:
         """
         Analyze options flow for unusual activity
@@ -97,16 +221,26 @@ class OptionsFlowAnalyzer:
         options = chain_data.get('options', {}).get('option', [])
         if not options:
             return self._empty_response()
-        
-        # Separate calls and puts
-        calls = [opt for opt in options if opt.get('option_type') == 'call']
-        puts = [opt for opt in options if opt.get('option_type') == 'put']
-        
-        # Calculate total volume and open interest
-        call_volume = sum(opt.get('volume', 0) for opt in calls)
-        put_volume = sum(opt.get('volume', 0) for opt in puts)
-        call_oi = sum(opt.get('open_interest', 0) for opt in calls)
-        put_oi = sum(opt.get('open_interest', 0) for opt in puts)
+
+        # Columnar load: one pass over the chain builds contiguous
+        # arrays, then every aggregate below is a C-level reduction
+        # instead of a generator scan over dicts
+        n = len(options)
+        vol = np.fromiter((opt.get('volume', 0) or 0 for opt in options),
+                          dtype=np.int64, count=n)
+        # No traded volume anywhere (common on illiquid tickers in
+        # pre-market): bail before building the other columns
+        if not vol.any():
+            return self._empty_response()
+        oi = np.fromiter((opt.get('open_interest', 0) or 0 for opt in options),
+                         dtype=np.int64, count=n)
+        is_call = np.fromiter((opt.get('option_type') == 'call' for opt in options),
+                              dtype=bool, count=n)
+
+        call_volume = int(vol[is_call].sum())
+        put_volume = int(vol[~is_call].sum())
+        call_oi = int(oi[is_call].sum())
+        put_oi = int(oi[~is_call].sum())
         
         # Calculate put/call ratio
         total_volume = call_volume + put_volume
@@ -153,30 +287,21 @@ class OptionsFlowAnalyzer:
                     confidence += 10
                 reason.append(f"Put volume spike (Vol/OI: {put_vol_ratio:.2f})")
         
-        # Find largest single trades (whale activity)
-        largest_calls = sorted([opt for opt in calls if opt.get('volume', 0) > 0],
-                              key=lambda x: x.get('volume', 0), reverse=True)[:3]
-        largest_puts = sorted([opt for opt in puts if opt.get('volume', 0) > 0],
-                             key=lambda x: x.get('volume', 0), reverse=True)[:3]
-        
+        # Find largest single trades (whale activity): partial-select
+        # the top 3 strikes per side instead of fully sorting the chain
         whale_trades = []
-        for opt in largest_calls:
-            if opt.get('volume', 0) > 100:  # Significant volume
-                whale_trades.append({
-                    'type': 'CALL',
-                    'strike': opt.get('strike'),
-                    'volume': opt.get('volume'),
-                    'premium': opt.get('last', 0)
-                })
-        
-        for opt in largest_puts:
-            if opt.get('volume', 0) > 100:
-                whale_trades.append({
-                    'type': 'PUT',
-                    'strike': opt.get('strike'),
-                    'volume': opt.get('volume'),
-                    'premium': opt.get('last', 0)
-                })
+        k = min(3, n)
+        for side, mask in (('CALL', is_call), ('PUT', ~is_call)):
+            side_vol = np.where(mask, vol, 0)
+            top_idx = np.argpartition(-side_vol, k - 1)[:k]
+            # argpartition leaves the top k unordered; sort just those
+            top_idx = top_idx[np.argsort(-side_vol[top_idx])]
+            for i in top_idx:
+                if side_vol[i] > 100:  # Significant volume
+                    opt = options[i]
+                    whale_trades.append(WhaleTrade(
+                        side, opt.get('strike'), opt.get('volume'),
+                        opt.get('last', 0)))
         
         # Calculate recommended action
         action = "HOLD"
@@ -194,40 +319,39 @@ class OptionsFlowAnalyzer:
             'put_volume': put_volume,
             'total_volume': total_volume,
             'reasons': reason,
-            'whale_trades': whale_trades[:5],  # Top 5 largest trades
+            'whale_trades': [t._asdict() for t in whale_trades[:5]],  # Top 5 largest trades
             'timestamp': datetime.now().isoformat()
         }
     
     def _empty_response(self) -> Dict:
         """Return empty response when no data available"""
-        return {
-            'signal': 'NEUTRAL',
-            'confidence': 0,
-            'action': 'HOLD',
-            'put_call_ratio': 0,
-            'call_volume': 0,
-            'put_volume': 0,
-            'total_volume': 0,
-            'reasons': ['No options data available'],
-            'whale_trades': [],
-            'timestamp': datetime.now().isoformat()
-        }
+        return dict(_EMPTY_RESPONSE, timestamp=datetime.now().isoformat())
     
+    def _signal_summary(self, symbol: str) -> Tuple[str, int]:
+        """Just the signal and confidence, for the decision paths.
+
+        Rides the analysis cache; the strategy layer calls
+        should_trade_on_options and get_options_boost back to back and
+        discards everything else in the full dict.
+        """
+        analysis = self.get_unusual_options_activity(symbol)
+        return analysis['signal'], analysis['confidence']
+
     def should_trade_on_options(self, symbol: str) -> Tuple[bool, str]:
         """
         Determine if options flow supports trading
         Returns: (should_trade, reason)
         """
-        analysis = self.get_unusual_options_activity(symbol)
-        
+        signal, confidence = self._signal_summary(symbol)
+
         # High confidence bullish signal
-        if analysis['signal'] == 'BULLISH' and analysis['confidence'] > 75:
-            return True, f"Strong bullish options flow ({analysis['confidence']}% conf)"
-        
+        if signal == 'BULLISH' and confidence > 75:
+            return True, f"Strong bullish options flow ({confidence}% conf)"
+
         # High confidence bearish signal - avoid buying
-        if analysis['signal'] == 'BEARISH' and analysis['confidence'] > 75:
-            return False, f"Strong bearish options flow ({analysis['confidence']}% conf)"
-        
+        if signal == 'BEARISH' and confidence > 75:
+            return False, f"Strong bearish options flow ({confidence}% conf)"
+
         # Neutral or low confidence
         return True, "Options flow neutral"
     
@@ -236,29 +360,17 @@ class OptionsFlowAnalyzer:
         Calculate position size multiplier based on options flow
         Returns: 0.5 to 2.0 multiplier
         """
-        analysis = self.get_unusual_options_activity(symbol)
-        
-        if analysis['confidence'] < 50:
+        signal, confidence = self._signal_summary(symbol)
+
+        if confidence < 50 or signal not in ('BULLISH', 'BEARISH'):
             return 1.0  # No adjustment
-        
-        if analysis['signal'] == 'BULLISH':
-            # Strong bullish flow = increase position
-            if analysis['confidence'] > 80:
-                return 1.5
-            elif analysis['confidence'] > 70:
-                return 1.3
-            else:
-                return 1.1
-        
-        elif analysis['signal'] == 'BEARISH':
-            # Bearish flow = reduce position
-            if analysis['confidence'] > 80:
-                return 0.5
-            elif analysis['confidence'] > 70:
-                return 0.7
-            else:
-                return 0.9
-        
+
+        # Walk the tier table: bullish flow scales the position up,
+        # bearish flow scales it down
+        for threshold, bullish, bearish in _BOOST_TIERS:
+            if confidence > threshold:
+                return bullish if signal == 'BULLISH' else bearish
+
         return 1.0
     
     def get_summary(self, symbols: List[str]) -> Dict:
@@ -270,9 +382,14 @@ class OptionsFlowAnalyzer:
             'timestamp': datetime.now().isoformat()
         }
         
-        for symbol in symbols:
-            analysis = self.get_unusual_options_activity(symbol)
-            
+        # One batched quotes call prunes dead symbols, then each
+        # remaining symbol blocks on its chain round trips; fanning out
+        # over threads makes the pass cost ~one symbol's latency
+        symbols = self._filter_active_symbols(symbols)
+        with ThreadPoolExecutor(max_workers=min(8, max(len(symbols), 1))) as executor:
+            analyses = list(executor.map(self.get_unusual_options_activity, symbols))
+
+        for symbol, analysis in zip(symbols, analyses):
             if analysis['signal'] == 'BULLISH' and analysis['confidence'] > 65:
                 summary['bullish_signals'].append({
                     'symbol': symbol,
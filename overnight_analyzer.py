@@ -3,20 +3,136 @@ Overnight Pattern Analyzer
 Analyzes after-hours and overnight price movements to predict next-day behavior
 """
 import logging
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
 from typing import Dict, List
-import numpy as np
-from database import Database
+from _njit import njit
 
 logger = logging.getLogger(__name__)
 
+# Code tables for the scoring kernel below
+_DIRECTIONS = ('NEUTRAL', 'UP', 'DOWN')
+_VOL_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+_ACTIONS = ('HOLD', 'BUY', 'SELL', 'WAIT')
+_STRENGTHS = ('NEUTRAL', 'MODERATE', 'STRONG', 'CAUTION')
+
+
+@njit(cache=True)
+def _score_next_day(overnight_change, volume_change, volatility, momentum,
+                    gap, rsi):
+    """Next-day scoring branch tree on plain floats.
+
+    Returns (direction, confidence, volatility_level, action, strength)
+    with the first and last three as indices into the code tables
+    above. Compiled with numba when available, plain Python otherwise.
+    """
+    direction_score = 0
+
+    # Strong overnight gains often continue into morning
+    if overnight_change > 1:
+        direction_score += 2
+    elif overnight_change < -1:
+        direction_score -= 2
+
+    # Momentum indicator
+    if momentum > 0.5:
+        direction_score += 1
+    elif momentum < -0.5:
+        direction_score -= 1
+
+    # Volume surge suggests continuation
+    if volume_change > 20:
+        direction_score += 1 if overnight_change > 0 else -1
+
+    # RSI extremes suggest reversal
+    if rsi > 70:  # Overbought
+        direction_score -= 1
+    elif rsi < 30:  # Oversold
+        direction_score += 1
+
+    # Gap behavior (gaps often fill)
+    if abs(gap) > 1:
+        # Large gaps tend to reverse
+        direction_score -= 1 if gap > 0 else 1
+
+    # Determine direction
+    if direction_score >= 2:
+        direction = 1
+        confidence = min(abs(direction_score) * 15, 85)
+    elif direction_score <= -2:
+        direction = 2
+        confidence = min(abs(direction_score) * 15, 85)
+    else:
+        direction = 0
+        confidence = 50
+
+    # Volatility prediction
+    if volatility > 3:
+        volatility_level = 2
+    elif volatility > 1.5:
+        volatility_level = 1
+    else:
+        volatility_level = 0
+
+    # Recommended action
+    if direction == 1 and confidence > 65 and rsi < 65:
+        action = 1
+        strength = 2 if confidence > 75 else 1
+    elif direction == 2 and confidence > 65:
+        action = 2
+        strength = 2 if confidence > 75 else 1
+    elif volatility_level == 2:
+        action = 3
+        strength = 3
+    else:
+        action = 0
+        strength = 0
+
+    return direction, confidence, volatility_level, action, strength
+
+
+# Rule table for prediction reasoning: (predicate, formatter) pairs
+# over (overnight, volume, volatility, momentum, gap, rsi), applied in
+# order. Data-driven so adding a reason is one row, not a new branch.
+_REASON_RULES = (
+    (lambda oc, vc, vol, mom, gap, rsi: abs(oc) > 1,
+     lambda oc, vc, vol, mom, gap, rsi:
+         f"Overnight {'gain' if oc > 0 else 'loss'} of {abs(oc):.1f}%"),
+    (lambda oc, vc, vol, mom, gap, rsi: abs(vc) > 20,
+     lambda oc, vc, vol, mom, gap, rsi:
+         f"Volume {'surge' if vc > 0 else 'decline'} of {abs(vc):.1f}%"),
+    (lambda oc, vc, vol, mom, gap, rsi: abs(mom) > 0.5,
+     lambda oc, vc, vol, mom, gap, rsi:
+         f"{'Positive' if mom > 0 else 'Negative'} momentum trend"),
+    (lambda oc, vc, vol, mom, gap, rsi: rsi > 70,
+     lambda oc, vc, vol, mom, gap, rsi: f"Overbought (RSI {rsi:.0f})"),
+    (lambda oc, vc, vol, mom, gap, rsi: rsi < 30,
+     lambda oc, vc, vol, mom, gap, rsi: f"Oversold (RSI {rsi:.0f})"),
+    (lambda oc, vc, vol, mom, gap, rsi: abs(gap) > 1,
+     lambda oc, vc, vol, mom, gap, rsi:
+         f"{'Upward' if gap > 0 else 'Downward'} gap of {abs(gap):.1f}% may fill"),
+    (lambda oc, vc, vol, mom, gap, rsi: vol > 3,
+     lambda oc, vc, vol, mom, gap, rsi: f"High volatility ({vol:.1f}%)"),
+)
+
+
 class OvernightPatternAnalyzer:
     """Analyzes overnight patterns to predict next-day market behavior."""
     
     def __init__(self):
+        # Deferred import: database drags in sqlalchemy and pandas,
+        # which callers of the pure helpers never need
+        from database import Database
         self.database = Database()
-        self.patterns = {}  # Store learned patterns
+        # Learned patterns, capped at 30 days per symbol; deque drops
+        # the oldest entry in O(1) instead of list.pop(0)'s shift
+        self.patterns = defaultdict(lambda: deque(maxlen=30))
         self.predictions = {}  # Next-day predictions
+        # Summary counters maintained at write time so
+        # get_overnight_summary reads in O(1) instead of re-scanning
+        # every prediction per call
+        self._direction_counts = Counter()
+        self._high_confidence = 0
     
     def analyze_overnight_movement(self, symbol: str, data) -> Dict:
         """
@@ -36,14 +152,17 @@ class OvernightPatternAnalyzer:
             overnight_change = ((latest['Close'] - previous['Close']) / previous['Close']) * 100
             volume_change = ((latest.get('Volume', 0) - previous.get('Volume', 1)) / previous.get('Volume', 1)) * 100
             
-            # Analyze volatility
-            recent_prices = data['Close'].tail(10)
-            volatility = recent_prices.std() / recent_prices.mean() * 100
-            
+            # Analyze volatility on the raw ndarray - slicing is free
+            # and the reductions skip pandas dispatch (ddof=1 keeps
+            # pandas' sample std)
+            close = data['Close'].to_numpy()
+            tail10 = close[-10:]
+            volatility = tail10.std(ddof=1) / tail10.mean() * 100
+
             # Calculate momentum
-            if len(data) >= 5:
-                short_ma = data['Close'].tail(5).mean()
-                long_ma = data['Close'].tail(10).mean() if len(data) >= 10 else short_ma
+            if len(close) >= 5:
+                short_ma = close[-5:].mean()
+                long_ma = tail10.mean() if len(close) >= 10 else short_ma
                 momentum = ((short_ma - long_ma) / long_ma) * 100 if long_ma > 0 else 0
             else:
                 momentum = 0
@@ -79,6 +198,69 @@ class OvernightPatternAnalyzer:
             logger.error(f"Error analyzing overnight movement for {symbol}: {e}")
             return {}
     
+    def analyze_overnight_movement_batch(self, df) -> Dict[str, Dict]:
+        """
+        Analyze overnight movement for many symbols in one pass.
+
+        Takes a long-form frame with 'symbol', 'Close' and optionally
+        'Open'/'Volume'/'RSI' columns, rows ordered by date within each
+        symbol. All metrics are computed with grouped column arithmetic
+        - one C loop per metric across every symbol - instead of the
+        per-symbol iloc/tail calls of analyze_overnight_movement, whose
+        per-symbol output shape this matches.
+        """
+        results = {}
+        try:
+            if df is None or len(df) == 0 or 'symbol' not in df.columns:
+                return results
+
+            grp = df.groupby('symbol', sort=False)
+            counts = grp.size()
+            last = grp.tail(1).set_index('symbol')
+            prev = grp.tail(2).groupby('symbol', sort=False).head(1).set_index('symbol')
+
+            overnight = (last['Close'] - prev['Close']) / prev['Close'] * 100
+            if 'Volume' in df.columns:
+                prev_vol = prev['Volume'].replace(0, 1)
+                volume_change = (last['Volume'] - prev_vol) / prev_vol * 100
+            else:
+                volume_change = overnight * 0.0
+
+            g10 = grp.tail(10).groupby('symbol', sort=False)['Close']
+            volatility = g10.std() / g10.mean() * 100
+            ma5 = grp.tail(5).groupby('symbol', sort=False)['Close'].mean()
+            ma10 = g10.mean()
+            momentum = ((ma5 - ma10) / ma10 * 100).where(ma10 > 0, 0.0)
+
+            if 'Open' in df.columns:
+                gap = (last['Open'] - prev['Close']) / prev['Close'] * 100
+            else:
+                gap = overnight * 0.0
+            rsi = last['RSI'] if 'RSI' in last.columns else None
+
+            now = datetime.now()
+            for symbol in counts[counts >= 2].index:
+                analysis = {
+                    'symbol': symbol,
+                    'timestamp': now,
+                    'overnight_change_pct': float(overnight[symbol]),
+                    'volume_change_pct': float(volume_change[symbol]),
+                    'volatility': float(volatility[symbol]),
+                    'momentum': float(momentum[symbol]),
+                    'gap_pct': float(gap[symbol]),
+                    'current_price': float(last['Close'][symbol]),
+                    'rsi': float(rsi[symbol]) if rsi is not None else 50.0
+                }
+                analysis['prediction'] = self._predict_next_day_behavior(analysis)
+                self._store_pattern(symbol, analysis)
+                results[symbol] = analysis
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batch overnight analysis: {e}")
+            return results
+
     def _predict_next_day_behavior(self, analysis: Dict) -> Dict:
         """
         Predict next-day market behavior based on overnight patterns.
@@ -94,120 +276,50 @@ class OvernightPatternAnalyzer:
         momentum = analysis['momentum']
         gap = analysis['gap_pct']
         rsi = analysis['rsi']
-        
-        # Direction prediction logic
-        direction_score = 0
-        
-        # Strong overnight gains often continue into morning
-        if overnight_change > 1:
-            direction_score += 2
-        elif overnight_change < -1:
-            direction_score -= 2
-        
-        # Momentum indicator
-        if momentum > 0.5:
-            direction_score += 1
-        elif momentum < -0.5:
-            direction_score -= 1
-        
-        # Volume surge suggests continuation
-        if volume_change > 20:
-            direction_score += 1 if overnight_change > 0 else -1
-        
-        # RSI extremes suggest reversal
-        if rsi > 70:  # Overbought
-            direction_score -= 1
-        elif rsi < 30:  # Oversold
-            direction_score += 1
-        
-        # Gap behavior (gaps often fill)
-        if abs(gap) > 1:
-            # Large gaps tend to reverse
-            direction_score -= 1 if gap > 0 else 1
-        
-        # Determine direction
-        if direction_score >= 2:
-            direction = "UP"
-            confidence = min(abs(direction_score) * 15, 85)
-        elif direction_score <= -2:
-            direction = "DOWN"
-            confidence = min(abs(direction_score) * 15, 85)
-        else:
-            direction = "NEUTRAL"
-            confidence = 50
-        
-        # Volatility prediction
-        if volatility > 3:
-            volatility_level = "HIGH"
-        elif volatility > 1.5:
-            volatility_level = "MEDIUM"
-        else:
-            volatility_level = "LOW"
-        
-        # Recommended action
-        if direction == "UP" and confidence > 65 and rsi < 65:
-            action = "BUY"
-            action_strength = "STRONG" if confidence > 75 else "MODERATE"
-        elif direction == "DOWN" and confidence > 65:
-            action = "SELL"
-            action_strength = "STRONG" if confidence > 75 else "MODERATE"
-        elif volatility_level == "HIGH":
-            action = "WAIT"
-            action_strength = "CAUTION"
-        else:
-            action = "HOLD"
-            action_strength = "NEUTRAL"
-        
+
+        # Score through the compiled kernel; strings are mapped back
+        # from code indices at this boundary
+        direction, confidence, volatility_level, action, strength = \
+            _score_next_day(float(overnight_change), float(volume_change),
+                            float(volatility), float(momentum),
+                            float(gap), float(rsi))
+        direction = _DIRECTIONS[direction]
+
         return {
             'direction': direction,
-            'confidence': confidence,
-            'volatility_level': volatility_level,
-            'recommended_action': action,
-            'action_strength': action_strength,
+            'confidence': int(confidence),
+            'volatility_level': _VOL_LEVELS[volatility_level],
+            'recommended_action': _ACTIONS[action],
+            'action_strength': _STRENGTHS[strength],
             'reasoning': self._generate_reasoning(
                 overnight_change, volume_change, volatility, momentum, gap, rsi, direction
             )
         }
     
-    def _generate_reasoning(self, overnight_change, volume_change, volatility, 
+    def _generate_reasoning(self, overnight_change, volume_change, volatility,
                            momentum, gap, rsi, direction) -> str:
         """Generate human-readable reasoning for the prediction."""
-        reasons = []
-        
-        if abs(overnight_change) > 1:
-            reasons.append(f"Overnight {'gain' if overnight_change > 0 else 'loss'} of {abs(overnight_change):.1f}%")
-        
-        if abs(volume_change) > 20:
-            reasons.append(f"Volume {'surge' if volume_change > 0 else 'decline'} of {abs(volume_change):.1f}%")
-        
-        if abs(momentum) > 0.5:
-            reasons.append(f"{'Positive' if momentum > 0 else 'Negative'} momentum trend")
-        
-        if rsi > 70:
-            reasons.append(f"Overbought (RSI {rsi:.0f})")
-        elif rsi < 30:
-            reasons.append(f"Oversold (RSI {rsi:.0f})")
-        
-        if abs(gap) > 1:
-            reasons.append(f"{'Upward' if gap > 0 else 'Downward'} gap of {abs(gap):.1f}% may fill")
-        
-        if volatility > 3:
-            reasons.append(f"High volatility ({volatility:.1f}%)")
-        
+        args = (overnight_change, volume_change, volatility, momentum, gap, rsi)
+        reasons = [fmt(*args) for pred, fmt in _REASON_RULES if pred(*args)]
         return "; ".join(reasons) if reasons else "Normal market conditions"
     
     def _store_pattern(self, symbol: str, analysis: Dict):
         """Store overnight pattern for historical learning."""
-        if symbol not in self.patterns:
-            self.patterns[symbol] = []
-        
-        # Keep last 30 days of patterns
+        # maxlen keeps only the last 30 days of patterns
         self.patterns[symbol].append(analysis)
-        if len(self.patterns[symbol]) > 30:
-            self.patterns[symbol].pop(0)
-        
-        # Store prediction for next day
-        self.predictions[symbol] = analysis['prediction']
+
+        # Store prediction for next day, moving the symbol between
+        # summary buckets as its prediction is replaced
+        prediction = analysis['prediction']
+        previous = self.predictions.get(symbol)
+        if previous is not None:
+            self._direction_counts[previous.get('direction')] -= 1
+            if previous.get('confidence', 0) > 70:
+                self._high_confidence -= 1
+        self._direction_counts[prediction.get('direction')] += 1
+        if prediction.get('confidence', 0) > 70:
+            self._high_confidence += 1
+        self.predictions[symbol] = prediction
     
     def get_next_day_prediction(self, symbol: str) -> Dict:
         """Get stored prediction for next trading day."""
@@ -230,10 +342,10 @@ class OvernightPatternAnalyzer:
         summary = {
             'timestamp': datetime.now(),
             'total_symbols_analyzed': len(self.predictions),
-            'bullish_predictions': sum(1 for p in self.predictions.values() if p.get('direction') == 'UP'),
-            'bearish_predictions': sum(1 for p in self.predictions.values() if p.get('direction') == 'DOWN'),
-            'neutral_predictions': sum(1 for p in self.predictions.values() if p.get('direction') == 'NEUTRAL'),
-            'high_confidence_calls': sum(1 for p in self.predictions.values() if p.get('confidence', 0) > 70),
+            'bullish_predictions': self._direction_counts['UP'],
+            'bearish_predictions': self._direction_counts['DOWN'],
+            'neutral_predictions': self._direction_counts['NEUTRAL'],
+            'high_confidence_calls': self._high_confidence,
             'predictions_by_symbol': self.predictions
         }
         return summary
@@ -10,36 +10,162 @@ Rules:
 6. Tracks volatility and adjusts risk accordingly
 """
 
+import atexit
 import json
 import logging
-from datetime import datetime, timedelta
+import os
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# orjson serializes straight to bytes and is several times faster;
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
+# Snapshot thresholds: rewrite the full file once enough events
+# accumulate or enough time passes, whichever comes first
+_FLUSH_INTERVAL = 5.0
+_FLUSH_WRITES = 16
+
 
 class QuarterlyManager:
     """Manages quarterly principal, gain distribution, and volatility-based risk."""
-    
+
     def __init__(self, data_file: str = "quarterly_data.json"):
         self.data_file = Path(data_file)
         self.data = self._load_data()
-        
+        # Mutations append a small delta to an event log; the full file
+        # is only rewritten as a periodic snapshot, and startup replays
+        # any events the last snapshot missed
+        self._log_path = self.data_file.with_name('quarterly_events.jsonl')
+        replayed = self._replay_events()
+        self._log = open(self._log_path, 'ab', buffering=64 * 1024)
+        # Replayed events leave the snapshot stale, so start dirty
+        self._dirty = replayed > 0
+        self._writes_pending = 0
+        self._last_flush = time.monotonic()
+        # Risk adjustment memo, keyed on the inputs that feed it
+        self._risk_key = None
+        self._risk_val = 1.0
+        # get_status memo: valid while no mutation bumps the version
+        self._version = 0
+        self._status_cache = None
+        atexit.register(self.flush)
+
     def _load_data(self) -> Dict:
         """Load quarterly data from file."""
         if self.data_file.exists():
-            with open(self.data_file, 'r') as f:
-                return json.load(f)
+            with open(self.data_file, 'rb') as f:
+                data = _loads(f.read())
+            # Migrate timestamp fields persisted by older versions;
+            # they are kept as ints for cheap comparisons and writes
+            lpu = data.get('last_principal_update')
+            if isinstance(lpu, str):
+                data['last_principal_update'] = date.fromisoformat(lpu).toordinal()
+            ld = data.get('last_distribution')
+            if isinstance(ld, str):
+                data['last_distribution'] = int(datetime.fromisoformat(ld).timestamp() * 1e9)
+            elif isinstance(ld, int) and 0 < ld < 10 ** 12:
+                data['last_distribution'] = ld * 10 ** 9  # was epoch seconds
+            sd = data.get('start_date')
+            if isinstance(sd, str):
+                data['start_date'] = int(datetime.fromisoformat(sd).timestamp() * 1e9)
+            return data
         else:
             # Initialize with current quarter
             return self._initialize_quarter()
     
     def _save_data(self):
-        """Save quarterly data to file."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
-    
+        """Snapshot quarterly data atomically with a single write."""
+        # Serialize to one bytes buffer first (no indent - this is a
+        # machine-read file), then write-and-rename so readers never
+        # see a truncated file
+        self.data['snapshot_ts'] = time.time()
+        buf = _dumps(self.data)
+        tmp = self.data_file.with_suffix('.json.tmp')
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, buf)
+        finally:
+            os.close(fd)
+        os.replace(tmp, self.data_file)
+        # Everything in the log is now covered by the snapshot
+        log = getattr(self, '_log', None)
+        if log is not None:
+            log.flush()
+            log.seek(0)
+            log.truncate()
+
+    def _replay_events(self) -> int:
+        """Apply logged events newer than the last snapshot."""
+        if not self._log_path.exists():
+            return 0
+        snapshot_ts = self.data.get('snapshot_ts', 0.0)
+        applied = 0
+        try:
+            with open(self._log_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    event = _loads(line)
+                    if event.pop('ts', 0.0) <= snapshot_ts:
+                        continue
+                    self.data.update(event)
+                    applied += 1
+        except Exception as e:
+            logger.warning("Could not replay quarterly event log: %s", e)
+        if applied:
+            logger.info("Replayed %d quarterly events newer than snapshot", applied)
+        return applied
+
+    def _record_event(self, changes: Dict):
+        """Append a change delta to the event log; snapshot when due."""
+        event = dict(changes)
+        event['ts'] = time.time()
+        self._log.write(_dumps(event))
+        self._log.write(b'\n')
+        self._version += 1
+        self._dirty = True
+        self._writes_pending += 1
+        self._maybe_flush()
+
+    def _balance_event(self) -> Dict:
+        """Delta of every field update_balance may have touched."""
+        d = self.data
+        return {
+            'current_balance': d['current_balance'],
+            'daily_principal': d['daily_principal'],
+            'yesterday_principal': d['yesterday_principal'],
+            'last_principal_update': d['last_principal_update'],
+            'peak_balance': d['peak_balance'],
+            'max_drawdown': d['max_drawdown'],
+            'in_recovery_mode': d['in_recovery_mode'],
+        }
+
+    def _maybe_flush(self):
+        if (self._writes_pending >= _FLUSH_WRITES
+                or time.monotonic() - self._last_flush > _FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """Persist any unsaved changes immediately."""
+        if self._dirty:
+            self._save_data()
+            self._dirty = False
+            self._writes_pending = 0
+            self._last_flush = time.monotonic()
+
+
     def _initialize_quarter(self, starting_balance: float = None) -> Dict:
         """Initialize a new quarter."""
         now = datetime.now()
@@ -48,7 +174,7 @@ class QuarterlyManager:
         return {
             'quarter': quarter,
             'year': now.year,
-            'start_date': now.isoformat(),
+            'start_date': time.time_ns(),
             'quarter_start_principal': starting_balance or 100000.0,  # Quarter starting amount
             'daily_principal': starting_balance or 100000.0,  # Today's floor (ratchets up daily)
             'yesterday_principal': starting_balance or 100000.0,  # Yesterday's floor
@@ -56,24 +182,28 @@ class QuarterlyManager:
             'total_distributed': 0.0,
             'total_reinvested': 0.0,
             'last_distribution': None,
-            'last_principal_update': now.date().isoformat(),
+            'last_principal_update': now.toordinal(),
             'in_recovery_mode': False,
             'volatility_score': 0.0,
             'max_drawdown': 0.0,
             'peak_balance': starting_balance or 100000.0
         }
     
-    def check_new_quarter(self, current_balance: float) -> bool:
+    def check_new_quarter(self, current_balance: float,
+                          now: Optional[datetime] = None) -> bool:
         """Check if we've entered a new quarter and initialize if needed."""
-        now = datetime.now()
+        now = now or datetime.now()
         current_quarter = (now.month - 1) // 3 + 1
         
         if current_quarter != self.data['quarter'] or now.year != self.data['year']:
             logger.info(f"New quarter detected: Q{current_quarter} {now.year}")
             
             # Carry forward current balance as new principal
+            # Quarter rollover is rare and important - persist right away
             self.data = self._initialize_quarter(current_balance)
-            self._save_data()
+            self._version += 1
+            self._dirty = True
+            self.flush()
             return True
         return False
     
@@ -89,13 +219,15 @@ class QuarterlyManager:
         - in_recovery: bool
         - principal_protected: bool
         """
-        self.check_new_quarter(current_balance)
-        
-        # Check if it's a new day - if so, ratchet the principal
+        # One clock read per update; check_new_quarter shares it
         now = datetime.now()
-        today = now.date().isoformat()
-        
-        if today != self.data['last_principal_update']:
+        self.check_new_quarter(current_balance, now)
+
+        # Check if it's a new day - if so, ratchet the principal.
+        # Day ordinals are ints, so the comparison is one CPU op
+        today_ord = now.toordinal()
+
+        if today_ord != self.data['last_principal_update']:
             # New day - check if yesterday's balance was higher than yesterday's floor
             yesterday_balance = self.data['current_balance']
             yesterday_floor = self.data['daily_principal']
@@ -113,7 +245,7 @@ class QuarterlyManager:
                 logger.info(f"🔒 DAILY RATCHET: Floor raised from ${yesterday_floor:,.2f} to ${self.data['daily_principal']:,.2f}")
                 logger.info(f"📤 Available to withdraw: ${distributable:,.2f} (40% of yesterday's ${daily_gain:,.2f} gain)")
             
-            self.data['last_principal_update'] = today
+            self.data['last_principal_update'] = today_ord
         
         daily_floor = self.data['daily_principal']
         previous_balance = self.data['current_balance']
@@ -132,7 +264,7 @@ class QuarterlyManager:
         if current_balance < daily_floor:
             self.data['in_recovery_mode'] = True
             logger.warning(f"⚠️  RECOVERY MODE: Balance ${current_balance:,.2f} below today's floor ${daily_floor:,.2f}")
-            self._save_data()
+            self._record_event(self._balance_event())
             return {
                 'can_distribute': False,
                 'distributable_amount': 0.0,
@@ -156,8 +288,8 @@ class QuarterlyManager:
             # 40% can be distributed, 60% will become tomorrow's floor (after daily ratchet)
             distributable_now = todays_gain * 0.40
             staying_in = todays_gain * 0.60
-            
-            self._save_data()
+
+            self._record_event(self._balance_event())
             return {
                 'can_distribute': True,
                 'distributable_amount': distributable_now,
@@ -170,7 +302,7 @@ class QuarterlyManager:
             }
         else:
             # At floor, no gains yet today
-            self._save_data()
+            self._record_event(self._balance_event())
             return {
                 'can_distribute': False,
                 'distributable_amount': 0.0,
@@ -185,15 +317,19 @@ class QuarterlyManager:
     def record_distribution(self, amount: float):
         """Record a distribution of gains."""
         self.data['total_distributed'] += amount
-        self.data['last_distribution'] = datetime.now().isoformat()
-        self.data['principal'] += amount  # Adjust principal after withdrawal
-        self._save_data()
+        self.data['last_distribution'] = time.time_ns()
+        self.data['current_balance'] -= amount  # Cash leaves the account
+        self._record_event({
+            'total_distributed': self.data['total_distributed'],
+            'last_distribution': self.data['last_distribution'],
+            'current_balance': self.data['current_balance'],
+        })
         logger.info(f"Distributed ${amount:.2f}. Total distributed this quarter: ${self.data['total_distributed']:.2f}")
     
     def update_volatility(self, volatility_score: float):
         """Update volatility score (0-100, higher = more volatile)."""
         self.data['volatility_score'] = volatility_score
-        self._save_data()
+        self._record_event({'volatility_score': volatility_score})
     
     def get_risk_adjustment(self) -> float:
         """
@@ -203,18 +339,32 @@ class QuarterlyManager:
         - High volatility = lower multiplier (reduce position sizes)
         - High drawdown = lower multiplier (be more conservative)
         """
+        # Pure function of three slowly-changing fields, and called from
+        # both get_status and per-trade sizing - memoize on the inputs
+        key = (self.data['volatility_score'], self.data['max_drawdown'],
+               self.data['in_recovery_mode'])
+        if key == self._risk_key:
+            return self._risk_val
+
         volatility_factor = max(0.5, 1.0 - (self.data['volatility_score'] / 100))
         drawdown_factor = max(0.5, 1.0 - (self.data['max_drawdown'] * 2))
-        
+
         # If in recovery mode, be extra conservative
         recovery_factor = 0.5 if self.data['in_recovery_mode'] else 1.0
-        
+
         adjustment = volatility_factor * drawdown_factor * recovery_factor
-        return max(0.2, min(1.0, adjustment))  # Clamp between 0.2 and 1.0
+        self._risk_key = key
+        self._risk_val = max(0.2, min(1.0, adjustment))  # Clamp between 0.2 and 1.0
+        return self._risk_val
     
     def get_status(self) -> Dict:
         """Get current quarterly status."""
-        return {
+        # Dashboard polls call this far more often than the data
+        # changes; rebuild only after a mutation bumped the version
+        if self._status_cache is not None and self._status_cache[0] == self._version:
+            return dict(self._status_cache[1])
+
+        status = {
             'quarter': f"Q{self.data['quarter']} {self.data['year']}",
             'quarter_start_principal': self.data['quarter_start_principal'],
             'daily_floor': self.data['daily_principal'],
@@ -230,7 +380,9 @@ class QuarterlyManager:
             'risk_adjustment': self.get_risk_adjustment(),
             'peak_balance': self.data['peak_balance']
         }
-    
+        self._status_cache = (self._version, status)
+        return dict(status)
+
     def should_reduce_risk(self) -> bool:
         """Determine if bot should reduce risk based on conditions."""
         # Reduce risk if:
@@ -248,7 +400,11 @@ class QuarterlyManager:
         self.data['max_drawdown'] = 0.0
         self.data['volatility_score'] = 0.0
         self.data['peak_balance'] = self.data['current_balance']
-        self._save_data()
+        self._record_event({
+            'max_drawdown': 0.0,
+            'volatility_score': 0.0,
+            'peak_balance': self.data['peak_balance'],
+        })
 
 
 def main():
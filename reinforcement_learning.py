@@ -5,12 +5,61 @@ The bot learns from every trade to improve decision-making over time.
 import numpy as np
 import json
 import os
+from bisect import bisect_right
 from typing import Dict, List, Tuple
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# orjson serializes straight to bytes and is several times faster;
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
+# Action order is fixed; Q-values are stored column-per-action
+_ACTIONS = ('BUY', 'SELL', 'HOLD')
+_ACTION_IX = {a: i for i, a in enumerate(_ACTIONS)}
+
+# The state space is 3 RSI x 2 MACD x 3 trend x 3 volume buckets, so a
+# state packs into one small int and indexes the Q-array directly
+_N_STATES = 54
+_RSI_IX = {'oversold': 0, 'neutral': 1, 'overbought': 2}
+_MACD_IX = {'bearish': 0, 'bullish': 1}
+_TREND_IX = {'down': 0, 'flat': 1, 'up': 2}
+_VOLUME_IX = {'low': 0, 'normal': 1, 'high': 2}
+
+# Bucket edges for discretization; bisect_right on a tiny tuple is a
+# branch-free C call (exact-threshold values land in the upper bucket)
+_RSI_TH = (30, 70)
+_TREND_TH = (-0.5, 0.5)
+_VOLUME_TH = (0.7, 1.3)
+
+
+def _state_id_from_key(key: str) -> int:
+    """Map a legacy 'rsi_macd_trend_volume' state string to its id."""
+    rsi, macd, trend, volume = key.split('_')
+    return (_RSI_IX[rsi] * 18 + _MACD_IX[macd] * 9
+            + _TREND_IX[trend] * 3 + _VOLUME_IX[volume])
+
+
+def _atomic_write_json(path: str, payload: Dict):
+    """Serialize to one bytes buffer and write-and-rename atomically."""
+    buf = _dumps(payload)
+    tmp = path + '.tmp'
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
 class QLearningAgent:
     """
     Q-Learning agent that learns optimal trading actions.
@@ -30,9 +79,11 @@ class QLearningAgent:
         self.discount_factor = discount_factor
         self.epsilon = epsilon
         
-        # Q-table stores learned values for state-action pairs
-        self.q_table = {}
-        
+        # Q-values live in one (54, 3) array indexed directly by the
+        # packed state id, so max/argmax are single vectorized calls
+        # with no string hashing at all
+        self._Q = np.zeros((_N_STATES, 3), dtype=np.float32)
+
         # Performance tracking
         self.total_reward = 0
         self.trade_count = 0
@@ -43,28 +94,27 @@ class QLearningAgent:
         
         logger.info(f"Q-Learning agent initialized (LR={learning_rate}, DF={discount_factor}, E={epsilon})")
     
-    def get_state(self, market_data: Dict) -> str:
+    def get_state(self, market_data: Dict) -> int:
         """
-        Convert market conditions into a discrete state.
-        State includes: trend, volatility, RSI level, momentum
+        Convert market conditions into a discrete state id (0-53).
+        State includes: RSI level, MACD sign, trend, volume ratio.
         """
         # Extract key indicators
         rsi = market_data.get('RSI', 50)
         macd = market_data.get('MACD', 0)
         price_change = market_data.get('price_change_pct', 0)
         volume_ratio = market_data.get('volume_ratio', 1.0)
-        
-        # Discretize into states
-        rsi_state = 'oversold' if rsi < 30 else 'overbought' if rsi > 70 else 'neutral'
-        macd_state = 'bullish' if macd > 0 else 'bearish'
-        trend_state = 'up' if price_change > 0.5 else 'down' if price_change < -0.5 else 'flat'
-        volume_state = 'high' if volume_ratio > 1.3 else 'low' if volume_ratio < 0.7 else 'normal'
-        
-        # Combine into state string
-        state = f"{rsi_state}_{macd_state}_{trend_state}_{volume_state}"
-        return state
-    
-    def get_action(self, state: str, traditional_signal: str) -> str:
+
+        # Discretize into small ints (oversold/neutral/overbought etc.)
+        rsi_i = bisect_right(_RSI_TH, rsi)
+        macd_i = 1 if macd > 0 else 0
+        trend_i = bisect_right(_TREND_TH, price_change)
+        volume_i = bisect_right(_VOLUME_TH, volume_ratio)
+
+        # Pack into one id - doubles as the Q-array row index
+        return rsi_i * 18 + macd_i * 9 + trend_i * 3 + volume_i
+
+    def get_action(self, state: int, traditional_signal: str) -> str:
         """
         Choose an action (BUY, SELL, HOLD) using epsilon-greedy policy.
         
@@ -80,18 +130,15 @@ class QLearningAgent:
             logger.debug(f"Exploring: Using traditional signal {traditional_signal}")
             return traditional_signal
         
-        # Exploitation: Use learned Q-values
-        if state not in self.q_table:
-            self.q_table[state] = {'BUY': 0.0, 'SELL': 0.0, 'HOLD': 0.0}
-        
-        # Choose action with highest Q-value
-        q_values = self.q_table[state]
-        best_action = max(q_values, key=q_values.get)
-        
-        logger.debug(f"State: {state}, Q-values: {q_values}, Chosen: {best_action}")
+        # Exploitation: Use learned Q-values (ties break toward BUY,
+        # matching the old dict insertion order)
+        q_values = self._Q[state]
+        best_action = _ACTIONS[int(q_values.argmax())]
+
+        logger.debug("State: %s, Q-values: %s, Chosen: %s", state, q_values, best_action)
         return best_action
     
-    def update_q_value(self, state: str, action: str, reward: float, next_state: str):
+    def update_q_value(self, state: int, action: str, reward: float, next_state: int):
         """
         Update Q-value based on reward received.
         This is where learning happens!
@@ -102,21 +149,16 @@ class QLearningAgent:
             reward: Reward received (profit/loss)
             next_state: New market state after action
         """
-        # Initialize states if new
-        if state not in self.q_table:
-            self.q_table[state] = {'BUY': 0.0, 'SELL': 0.0, 'HOLD': 0.0}
-        if next_state not in self.q_table:
-            self.q_table[next_state] = {'BUY': 0.0, 'SELL': 0.0, 'HOLD': 0.0}
-        
-        # Q-Learning update formula
-        current_q = self.q_table[state][action]
-        max_next_q = max(self.q_table[next_state].values())
-        
+        # Q-Learning update formula on the array rows
+        a = _ACTION_IX[action]
+        current_q = float(self._Q[state, a])
+        max_next_q = float(self._Q[next_state].max())
+
         new_q = current_q + self.learning_rate * (
             reward + self.discount_factor * max_next_q - current_q
         )
-        
-        self.q_table[state][action] = new_q
+
+        self._Q[state, a] = new_q
         
         # Track performance
         self.total_reward += reward
@@ -163,44 +205,65 @@ class QLearningAgent:
     def save_q_table(self):
         """Save learned Q-table to disk."""
         try:
-            data = {
-                'q_table': self.q_table,
-                'total_reward': self.total_reward,
-                'trade_count': self.trade_count,
-                'win_count': self.win_count,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            with open('q_learning_data.json', 'w') as f:
-                json.dump(data, f, indent=2)
-            
+            tmp = 'q_learning_data.npz.tmp'
+            with open(tmp, 'wb') as f:
+                np.savez(
+                    f,
+                    q=self._Q,
+                    totals=np.array([self.total_reward, self.trade_count,
+                                     self.win_count], dtype=np.float64)
+                )
+            os.replace(tmp, 'q_learning_data.npz')
+
             logger.debug("Q-table saved successfully")
         except Exception as e:
             logger.error(f"Error saving Q-table: {e}")
-    
+
     def load_q_table(self):
         """Load previously learned Q-table from disk."""
         try:
-            if os.path.exists('q_learning_data.json'):
-                with open('q_learning_data.json', 'r') as f:
-                    data = json.load(f)
-                
-                self.q_table = data.get('q_table', {})
+            if os.path.exists('q_learning_data.npz'):
+                with np.load('q_learning_data.npz') as data:
+                    if 'states' in data:
+                        # Interim format that listed state strings per row
+                        for key, row in zip(data['states'].tolist(),
+                                            data['q']):
+                            self._Q[_state_id_from_key(key)] = row
+                    else:
+                        self._Q = data['q'].astype(np.float32)
+                    totals = data['totals']
+                    self.total_reward = float(totals[0])
+                    self.trade_count = int(totals[1])
+                    self.win_count = int(totals[2])
+            elif os.path.exists('q_learning_data.json'):
+                # Legacy dict-of-dicts format from before the array rewrite
+                with open('q_learning_data.json', 'rb') as f:
+                    data = _loads(f.read())
+
+                for key, q_values in data.get('q_table', {}).items():
+                    self._Q[_state_id_from_key(key)] = [q_values.get(a, 0.0)
+                                                        for a in _ACTIONS]
                 self.total_reward = data.get('total_reward', 0)
                 self.trade_count = data.get('trade_count', 0)
                 self.win_count = data.get('win_count', 0)
-                
-                logger.info(f"Loaded Q-table: {len(self.q_table)} states, {self.trade_count} trades learned")
+            else:
+                return
+
+            logger.info(f"Loaded Q-table: {self._states_learned()} states, {self.trade_count} trades learned")
         except Exception as e:
             logger.warning(f"Could not load Q-table: {e}")
     
+    def _states_learned(self) -> int:
+        """Number of states with at least one learned Q-value."""
+        return int(np.count_nonzero(self._Q.any(axis=1)))
+
     def get_performance_stats(self) -> Dict:
         """Get learning performance statistics."""
         win_rate = (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0
         avg_reward = self.total_reward / self.trade_count if self.trade_count > 0 else 0
-        
+
         return {
-            'states_learned': len(self.q_table),
+            'states_learned': self._states_learned(),
             'total_trades': self.trade_count,
             'winning_trades': self.win_count,
             'win_rate': win_rate,
@@ -227,81 +290,93 @@ class AdaptiveStrategySelector:
     Learns which strategy (Momentum, Mean Reversion, ML Hybrid) works best.
     Automatically switches strategies based on market conditions.
     """
-    
+
+    STRATEGIES = ('momentum', 'mean_reversion', 'ml_hybrid')
+
     def __init__(self):
-        self.strategy_performance = {
-            'momentum': {'wins': 0, 'losses': 0, 'total_pnl': 0},
-            'mean_reversion': {'wins': 0, 'losses': 0, 'total_pnl': 0},
-            'ml_hybrid': {'wins': 0, 'losses': 0, 'total_pnl': 0}
-        }
+        # Per-strategy tallies in parallel arrays so scoring is one
+        # vector expression instead of a dict loop
+        self._strat_ix = {s: i for i, s in enumerate(self.STRATEGIES)}
+        self._wins = np.zeros(len(self.STRATEGIES), dtype=np.int64)
+        self._losses = np.zeros(len(self.STRATEGIES), dtype=np.int64)
+        self._pnl = np.zeros(len(self.STRATEGIES), dtype=np.float64)
         self.current_strategy = 'momentum'
         self.evaluation_period = 20  # Evaluate every 20 trades
         self.trades_since_eval = 0
-        
+
         self.load_performance()
-    
+
     def record_trade(self, strategy: str, pnl: float):
         """Record trade result for a strategy."""
-        if strategy in self.strategy_performance:
+        i = self._strat_ix.get(strategy)
+        if i is not None:
             if pnl > 0:
-                self.strategy_performance[strategy]['wins'] += 1
+                self._wins[i] += 1
             else:
-                self.strategy_performance[strategy]['losses'] += 1
-            
-            self.strategy_performance[strategy]['total_pnl'] += pnl
+                self._losses[i] += 1
+
+            self._pnl[i] += pnl
             self.trades_since_eval += 1
-            
+
             if self.trades_since_eval >= self.evaluation_period:
                 self.select_best_strategy()
                 self.trades_since_eval = 0
-            
+
             self.save_performance()
-    
+
     def select_best_strategy(self):
         """Select strategy with best performance."""
-        best_strategy = None
-        best_score = float('-inf')
-        
-        for strategy, perf in self.strategy_performance.items():
-            total_trades = perf['wins'] + perf['losses']
-            if total_trades == 0:
-                continue
-            
-            win_rate = perf['wins'] / total_trades
-            avg_pnl = perf['total_pnl'] / total_trades
-            
-            # Score combines win rate and average P&L
-            score = win_rate * 0.5 + (avg_pnl / 100) * 0.5
-            
-            if score > best_score:
-                best_score = score
-                best_strategy = strategy
-        
-        if best_strategy and best_strategy != self.current_strategy:
+        totals = self._wins + self._losses
+        valid = totals > 0
+        if not valid.any():
+            return self.current_strategy
+
+        safe_totals = np.maximum(totals, 1)
+        win_rate = self._wins / safe_totals
+        avg_pnl = self._pnl / safe_totals
+
+        # Score combines win rate and average P&L; unplayed strategies
+        # are excluded just like the old dict loop skipped them
+        scores = np.where(valid, win_rate * 0.5 + avg_pnl * 0.005, -np.inf)
+        best_strategy = self.STRATEGIES[int(scores.argmax())]
+
+        if best_strategy != self.current_strategy:
             logger.info(f"Switching strategy from {self.current_strategy} to {best_strategy}")
             self.current_strategy = best_strategy
-        
+
         return self.current_strategy
-    
+
+    def _performance_dict(self) -> Dict:
+        """Tallies in the persisted {strategy: {...}} shape."""
+        return {
+            s: {'wins': int(self._wins[i]), 'losses': int(self._losses[i]),
+                'total_pnl': float(self._pnl[i])}
+            for i, s in enumerate(self.STRATEGIES)
+        }
+
     def save_performance(self):
         """Save strategy performance data."""
         try:
-            with open('strategy_performance.json', 'w') as f:
-                json.dump({
-                    'performance': self.strategy_performance,
-                    'current_strategy': self.current_strategy
-                }, f, indent=2)
+            _atomic_write_json('strategy_performance.json', {
+                'performance': self._performance_dict(),
+                'current_strategy': self.current_strategy
+            })
         except Exception as e:
             logger.error(f"Error saving strategy performance: {e}")
-    
+
     def load_performance(self):
         """Load strategy performance data."""
         try:
             if os.path.exists('strategy_performance.json'):
-                with open('strategy_performance.json', 'r') as f:
-                    data = json.load(f)
-                    self.strategy_performance = data.get('performance', self.strategy_performance)
-                    self.current_strategy = data.get('current_strategy', 'momentum')
-                    logger.info(f"Loaded strategy performance, using: {self.current_strategy}")
+                with open('strategy_performance.json', 'rb') as f:
+                    data = _loads(f.read())
+                for strategy, perf in data.get('performance', {}).items():
+                    i = self._strat_ix.get(strategy)
+                    if i is not None:
+                        self._wins[i] = perf.get('wins', 0)
+                        self._losses[i] = perf.get('losses', 0)
+                        self._pnl[i] = perf.get('total_pnl', 0.0)
+                self.current_strategy = data.get('current_strategy', 'momentum')
+                logger.info(f"Loaded strategy performance, using: {self.current_strategy}")
         except Exception as e:
             logger.warning(f"Could not load strategy performance: {e}")
@@ -32,11 +32,40 @@ class Strategy(ABC):
         pass
     
     @abstractmethod
-    def calculate_position_size(self, symbol: str, price: float, 
+    def calculate_position_size(self, symbol: str, price: float,
                                 account_value: float) -> int:
         """Calculate the number of shares to trade."""
         pass
 
+    def generate_signals_vectorized(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Generate a signal for every bar at once.
+
+        Args:
+            data: Historical price data with technical indicators
+
+        Returns:
+            int8 array aligned to data rows: 1 (BUY), -1 (SELL), 0 (HOLD)
+
+        The default implementation replays generate_signals per bar so
+        custom strategies keep working; built-in strategies override it
+        with a single vectorized computation over the indicator columns.
+
+        The indicator columns are already computed over the full series,
+        so each replay only needs the recent bars it inspects - a fixed
+        50-bar window slice keeps the fallback O(N) instead of O(N^2)
+        on ever-growing data.iloc[:i+1] prefixes.
+        """
+        signals = np.zeros(len(data), dtype=np.int8)
+        for i in range(len(data)):
+            window = data.iloc[max(0, i - 49):i + 1]
+            signal = self.generate_signals('', window)
+            if signal == 'BUY':
+                signals[i] = 1
+            elif signal == 'SELL':
+                signals[i] = -1
+        return signals
+
 
 class MomentumStrategy(Strategy):
     """
@@ -101,11 +130,45 @@ class MomentumStrategy(Strategy):
             logger.error(f"Error generating momentum signals for {symbol}: {e}")
             return 'HOLD'
     
-    def calculate_position_size(self, symbol: str, price: float, 
+    def generate_signals_vectorized(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized momentum signals over every bar."""
+        signals = np.zeros(len(data), dtype=np.int8)
+        if data.empty or len(data) < 50:
+            return signals
+
+        required_cols = ['RSI', 'MACD', 'MACD_Signal', 'SMA_20', 'SMA_50', 'Close']
+        if not all(col in data.columns for col in required_cols):
+            logger.warning("Missing required indicators for vectorized signals")
+            return signals
+
+        rsi = data['RSI'].to_numpy()
+        macd = data['MACD'].to_numpy()
+        macd_signal = data['MACD_Signal'].to_numpy()
+        price = data['Close'].to_numpy()
+        sma_20 = data['SMA_20'].to_numpy()
+        sma_50 = data['SMA_50'].to_numpy()
+
+        buy_score = (
+            (rsi < self.rsi_oversold).astype(np.int8) +
+            (macd > macd_signal).astype(np.int8) +
+            (price > sma_20).astype(np.int8) +
+            (sma_20 > sma_50).astype(np.int8)
+        )
+        sell_score = (
+            (rsi > self.rsi_overbought).astype(np.int8) +
+            (macd < macd_signal).astype(np.int8) +
+            (price < sma_20).astype(np.int8)
+        )
+
+        signals[buy_score >= 3] = 1
+        signals[sell_score >= 2] = -1
+        return signals
+
+    def calculate_position_size(self, symbol: str, price: float,
                                 account_value: float) -> int:
         """Calculate position size based on account value and risk."""
         from config import Config
-        
+
         max_position_value = account_value * Config.MAX_POSITION_SIZE
         shares = int(max_position_value / price)
         return max(1, shares)  # At least 1 share
@@ -159,11 +222,35 @@ class MeanReversionStrategy(Strategy):
             logger.error(f"Error generating mean reversion signals for {symbol}: {e}")
             return 'HOLD'
     
-    def calculate_position_size(self, symbol: str, price: float, 
+    def generate_signals_vectorized(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized mean reversion signals over every bar."""
+        signals = np.zeros(len(data), dtype=np.int8)
+        if data.empty or len(data) < 20:
+            return signals
+
+        required_cols = ['Close', 'BB_Upper', 'BB_Lower', 'BB_Middle', 'RSI']
+        if not all(col in data.columns for col in required_cols):
+            return signals
+
+        price = data['Close'].to_numpy()
+        bb_upper = data['BB_Upper'].to_numpy()
+        bb_lower = data['BB_Lower'].to_numpy()
+        bb_middle = data['BB_Middle'].to_numpy()
+        rsi = data['RSI'].to_numpy()
+
+        buy = (price <= bb_lower) & (rsi < 35)
+        sell = ((price >= bb_upper) & (rsi > 65)) | \
+               (np.abs(price - bb_middle) / bb_middle < 0.01)
+
+        signals[sell] = -1
+        signals[buy] = 1  # BUY wins on the rare overlap, matching the if/elif order
+        return signals
+
+    def calculate_position_size(self, symbol: str, price: float,
                                 account_value: float) -> int:
         """Calculate position size."""
         from config import Config
-        
+
         max_position_value = account_value * Config.MAX_POSITION_SIZE
         shares = int(max_position_value / price)
         return max(1, shares)
@@ -238,7 +325,44 @@ class MLHybridStrategy(Strategy):
             logger.error(f"Error generating ML hybrid signals for {symbol}: {e}")
             return 'HOLD'
     
-    def calculate_position_size(self, symbol: str, price: float, 
+    def generate_signals_vectorized(self, data: pd.DataFrame) -> np.ndarray:
+        """Vectorized ML hybrid scoring over every bar."""
+        signals = np.zeros(len(data), dtype=np.int8)
+        if data.empty or len(data) < self.lookback_period:
+            return signals
+
+        score = np.zeros(len(data), dtype=np.int64)
+
+        # RSI score
+        if 'RSI' in data.columns:
+            rsi = data['RSI'].to_numpy()
+            score += np.select(
+                [rsi < 30, rsi < 40, rsi > 70, rsi > 60],
+                [2, 1, -2, -1],
+                default=0
+            )
+
+        # MACD score
+        if 'MACD' in data.columns and 'MACD_Signal' in data.columns:
+            score += np.where(data['MACD'].to_numpy() > data['MACD_Signal'].to_numpy(), 1, -1)
+
+        # Price trend score
+        if all(col in data.columns for col in ['Close', 'SMA_20', 'SMA_50']):
+            price = data['Close'].to_numpy()
+            sma_20 = data['SMA_20'].to_numpy()
+            sma_50 = data['SMA_50'].to_numpy()
+            score += np.where((price > sma_20) & (sma_20 > sma_50), 2, 0)
+            score += np.where((price < sma_20) & (sma_20 < sma_50), -2, 0)
+
+        # Volume score
+        if 'Volume' in data.columns and 'Volume_MA' in data.columns:
+            score += (data['Volume'].to_numpy() > data['Volume_MA'].to_numpy() * 1.3).astype(np.int64)
+
+        signals[score >= 4] = 1
+        signals[score <= -3] = -1
+        return signals
+
+    def calculate_position_size(self, symbol: str, price: float,
                                 account_value: float) -> int:
         """Calculate position size based on confidence."""
         from config import Config
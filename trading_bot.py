@@ -267,8 +267,8 @@ class TradingBot:
                 if data.empty:
                     continue
                 
-                data = self.market_data.calculate_technical_indicators(data)
-                
+                data = self.market_data.calculate_technical_indicators(data, symbol)
+
                 # UNIFIED INTELLIGENCE GATHERING - Collect all data sources
                 intelligence = self.gather_intelligence(symbol, data)
                 
@@ -428,7 +428,7 @@ class TradingBot:
                     # Get new market state
                     data = self.market_data.get_historical_data(symbol, period='1d', interval='1m')
                     if not data.empty:
-                        data = self.market_data.calculate_technical_indicators(data)
+                        data = self.market_data.calculate_technical_indicators(data, symbol)
                         latest = data.iloc[-1]
                         new_market_data = {
                             'RSI': latest.get('RSI', 50),
@@ -506,7 +506,7 @@ class TradingBot:
                     if data.empty:
                         continue
                     
-                    data = self.market_data.calculate_technical_indicators(data)
+                    data = self.market_data.calculate_technical_indicators(data, symbol)
                     latest = data.iloc[-1]
                     
                     # OVERNIGHT PATTERN ANALYSIS